@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for Panek Video Program.
+
+Measures cold-start latency in fresh interpreter processes:
+- importing the Qt-free core (what batch workers pay)
+- importing the GUI module (core + PySide6 widgets)
+- creating the QApplication and main window, theme included
+- the ffmpeg/ffprobe PATH check done on every GUI launch
+- ffmpeg capability probing, uncached vs. served from the on-disk cache
+
+Usage:
+    python benchmarks/startup.py [--runs N]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SCENARIOS = {
+    "import core": "import panek_video_core",
+    "import gui module": "import panek_video_program",
+    "gui window": (
+        "import sys, panek_video_program as p, qdarktheme\n"
+        "from PySide6.QtWidgets import QApplication\n"
+        "app = QApplication(sys.argv)\n"
+        "qdarktheme.setup_theme('dark')\n"
+        "p.MainWindow()\n"
+    ),
+    "ensure ffmpeg": "import panek_video_core as c; c.ensure_ffmpeg()",
+    "capabilities (probe)": "import panek_video_core as c; c.ffmpeg_capabilities()",
+    "capabilities (cached)": "import panek_video_core as c; c.ffmpeg_capabilities()",
+}
+
+def time_snippet(code: str, env: dict) -> float:
+    """Run a snippet in a fresh interpreter and return its wall time in milliseconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="runs per scenario (default: 10)")
+    args = parser.parse_args()
+
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    baseline = [time_snippet("pass", env) for _ in range(args.runs)]
+    print(f"{'interpreter only':<24} median {statistics.median(baseline):8.1f} ms  min {min(baseline):8.1f} ms")
+
+    with tempfile.TemporaryDirectory() as cache:
+        env["PANEK_VIDEO_CACHE_DIR"] = cache
+        for name, code in SCENARIOS.items():
+            samples = []
+            for _ in range(args.runs):
+                if name == "capabilities (probe)":
+                    for f in Path(cache).iterdir():
+                        f.unlink()
+                try:
+                    samples.append(time_snippet(code, env))
+                except subprocess.CalledProcessError:
+                    break
+            if not samples:
+                print(f"{name:<24} skipped (failed to run)")
+                continue
+            print(f"{name:<24} median {statistics.median(samples):8.1f} ms  min {min(samples):8.1f} ms")
+
+if __name__ == "__main__":
+    main()
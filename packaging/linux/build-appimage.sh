@@ -20,6 +20,7 @@ mkdir -p "${APPDIR}/usr/lib/python3/dist-packages"
 # Copy application files
 cp panek_video_program.py "${APPDIR}/usr/bin/panek-video-program"
 chmod +x "${APPDIR}/usr/bin/panek-video-program"
+cp panek_video_core.py panek_video_farm.py panek_video_calibrate.py "${APPDIR}/usr/bin/"
 
 # Copy desktop file and icon
 cp packaging/linux/appdir/panek-video.desktop "${APPDIR}/"
@@ -18,10 +18,12 @@ mkdir -p "${BUILD_DIR}/usr/bin"
 mkdir -p "${BUILD_DIR}/usr/share/applications"
 mkdir -p "${BUILD_DIR}/usr/share/icons/hicolor/256x256/apps"
 mkdir -p "${BUILD_DIR}/usr/share/doc/panek-video-program"
+mkdir -p "${BUILD_DIR}/usr/lib/python3/dist-packages"
 
 # Copy application files
 cp panek_video_program.py "${BUILD_DIR}/usr/bin/panek-video-program"
 chmod +x "${BUILD_DIR}/usr/bin/panek-video-program"
+cp panek_video_core.py panek_video_farm.py panek_video_calibrate.py "${BUILD_DIR}/usr/lib/python3/dist-packages/"
 
 # Copy desktop file and icon
 cp packaging/linux/panek-video.desktop "${BUILD_DIR}/usr/share/applications/"
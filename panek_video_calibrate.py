@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Panek Video Program - Encoding Profile Calibration
+
+Renders a short excerpt of each sample with each encoding profile and
+records what the profile actually costs and delivers on this machine:
+
+- encode speed (frames per second and multiple of real time)
+- output bitrate (kb/s, video + audio) over the real length of the output
+- objective quality against the unencoded source: SSIM and PSNR, computed
+  with ffmpeg's ssim/psnr filters
+
+Every profile is scored against the same reference: the source at its native
+size, scaled down so its longer side is at most 1920 pixels (COMPARE_MAX_SIDE).
+The picture area of each encode (without the padding bars) is scaled to that
+size too, so a profile that loses resolution scores lower and the bars, which
+any encoder reproduces perfectly, do not inflate the scores.
+
+The averages are saved to the user cache (see panek_video_core.calibration_path)
+and shown next to each profile in the GUI.
+
+Usage:
+    python panek_video_calibrate.py --sample cover.png song.mp3 --sample clip.mp4 song.mp3
+    python panek_video_calibrate.py --sample cover.png song.mp3 --profiles draft,standard --seconds 30
+
+This software uses FFmpeg (https://ffmpeg.org) licensed under the LGPL/GPL.
+"""
+
+import sys
+import os
+import re
+import json
+import time
+import argparse
+import datetime
+import tempfile
+import subprocess
+
+from panek_video_core import (
+    ENCODING_PROFILES, ensure_ffmpeg, ffprobe_duration_seconds, ffmpeg_capabilities,
+    is_video_file, no_window_flags, calibration_path, get_profile, build_ffmpeg_cmd
+)
+
+DEFAULT_SECONDS = 20  # Length of the excerpt encoded per sample
+COMPARE_MAX_SIDE = 1920  # Longer side of the size all profiles are scored at
+
+def _run(cmd: list) -> subprocess.CompletedProcess:
+    return subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+                          creationflags=no_window_flags())
+
+def probe_size(path: str) -> tuple:
+    """Return the (width, height) of the first video stream of an image or video."""
+    proc = _run(["ffprobe", "-v", "error", "-select_streams", "v:0",
+                 "-show_entries", "stream=width,height", "-of", "csv=p=0", path])
+    try:
+        width, height = (int(value) for value in proc.stdout.strip().split(",")[:2])
+    except ValueError:
+        raise RuntimeError(f"Could not determine the picture size of {path}")
+    return width, height
+
+def compare_size(width: int, height: int) -> tuple:
+    """Return the size quality is measured at: the source's, with the longer side capped at COMPARE_MAX_SIDE."""
+    scale = min(1.0, COMPARE_MAX_SIDE / max(width, height))
+    return max(2, round(width * scale / 2) * 2), max(2, round(height * scale / 2) * 2)
+
+def content_area(width: int, height: int, profile: dict) -> tuple:
+    """
+    Return (w, h, x, y) of the picture inside an encode of a width x height
+    source, i.e. without the bars added by the profile's scale and pad.
+    """
+    out_w, out_h = profile["width"], profile["height"]
+    w = min(round(out_h * width / height), out_w)
+    h = min(round(out_w * height / width), out_h)
+    # pad aligns the picture to the chroma grid, so the offsets are even
+    return w, h, ((out_w - w) // 2) & ~1, ((out_h - h) // 2) & ~1
+
+def measure_quality(encoded: str, media_path: str, profile: dict, seconds: float) -> tuple:
+    """
+    Return (ssim, psnr) of an encode against the source, both scaled to the
+    shared comparison size (see compare_size).
+    """
+    source_w, source_h = probe_size(media_path)
+    width, height = compare_size(source_w, source_h)
+    crop_w, crop_h, crop_x, crop_y = content_area(source_w, source_h, profile)
+    source = ["-t", f"{seconds:.3f}", "-i", media_path]
+    if not is_video_file(media_path):
+        source = ["-loop", "1"] + source
+    # The reference is tagged bt709 like the encode, so both convert to YUV with the same matrix
+    graph = (
+        f"[1:v]scale={width}:{height},fps={profile['fps']},"
+        f"setparams=colorspace=bt709:color_primaries=bt709:color_trc=bt709,format=yuv420p,setpts=PTS-STARTPTS,"
+        f"split[r1][r2];"
+        f"[0:v]crop={crop_w}:{crop_h}:{crop_x}:{crop_y},scale={width}:{height}:flags=bicubic,"
+        f"format=yuv420p,setpts=PTS-STARTPTS,split[e1][e2];"
+        f"[e1][r1]ssim;[e2][r2]psnr"
+    )
+    proc = _run(["ffmpeg", "-hide_banner", "-i", encoded] + source +
+                ["-filter_complex", graph, "-f", "null", "-"])
+    ssim = re.search(r"SSIM .*All:([\d.]+)", proc.stderr)
+    psnr = re.search(r"PSNR .*average:([\d.]+|inf)", proc.stderr)
+    if not ssim or not psnr:
+        raise RuntimeError(f"Could not measure quality of {encoded}:\n{proc.stderr[-1000:]}")
+    return float(ssim.group(1)), float(psnr.group(1))
+
+def calibrate_run(name: str, media_path: str, audio_path: str, seconds: float, work_dir: str) -> dict:
+    """Encode one sample excerpt with one profile and measure speed, bitrate and quality."""
+    profile = get_profile(name)
+    seconds = min(seconds, ffprobe_duration_seconds(audio_path))
+    if seconds <= 0:
+        raise RuntimeError(f"Could not determine audio duration of {audio_path}")
+
+    out_path = os.path.join(work_dir, f"{name}.mp4")
+    cmd = build_ffmpeg_cmd(media_path, audio_path, out_path, "calibration",
+                           media_duration=seconds, profile=name)
+    cmd[-1:-1] = ["-t", f"{seconds:.3f}"]  # Limit the output to the excerpt
+
+    start = time.perf_counter()
+    proc = _run(cmd)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Encoding with '{name}' failed:\n{proc.stderr[-1000:]}")
+
+    # A video shorter than the excerpt ends the output early (-shortest)
+    length = ffprobe_duration_seconds(out_path)
+    if length <= 0:
+        raise RuntimeError(f"Could not determine the length of the '{name}' encode")
+    frames = re.findall(r"^frame=(\d+)", proc.stdout, re.MULTILINE)
+    frames = int(frames[-1]) if frames else round(length * profile["fps"])
+    ssim, psnr = measure_quality(out_path, media_path, profile, seconds)
+    return {
+        "media": os.path.abspath(media_path),
+        "audio": os.path.abspath(audio_path),
+        "seconds": round(length, 3),
+        "encode_fps": frames / elapsed,
+        "realtime": length / elapsed,
+        "bitrate_kbps": os.path.getsize(out_path) * 8 / length / 1000,
+        "ssim": ssim,
+        "psnr": psnr,
+    }
+
+def summarize(runs: list) -> dict:
+    """Average the per-sample measurements of one profile."""
+    keys = ("encode_fps", "realtime", "bitrate_kbps", "ssim", "psnr")
+    summary = {key: sum(run[key] for run in runs) / len(runs) for key in keys}
+    summary["runs"] = runs
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure speed, size and quality of each encoding profile")
+    parser.add_argument("--sample", nargs=2, action="append", required=True, metavar=("MEDIA", "AUDIO"),
+                        help="an image or video plus an audio file (repeat for more samples)")
+    parser.add_argument("--profiles", default=",".join(ENCODING_PROFILES),
+                        help="comma-separated profiles to calibrate (default: all)")
+    parser.add_argument("--seconds", type=float, default=DEFAULT_SECONDS,
+                        help=f"length of the excerpt encoded per sample (default: {DEFAULT_SECONDS})")
+    parser.add_argument("--output", default=str(calibration_path()),
+                        help="where to save the results (default: the user cache, read by the GUI)")
+    args = parser.parse_args(argv)
+
+    ensure_ffmpeg()
+    names = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    for name in names:
+        get_profile(name)  # Fail early on typos
+
+    # Keep earlier measurements of profiles that are not re-run
+    try:
+        with open(args.output, encoding="utf-8") as f:
+            results = json.load(f)
+    except (OSError, ValueError):
+        results = {}
+    if not isinstance(results, dict):
+        results = {}
+    if not isinstance(results.get("profiles"), dict):
+        results["profiles"] = {}  # Missing or hand-edited; start the measurements afresh
+
+    print(f"{'profile':<16}{'encode fps':>12}{'realtime':>10}{'kb/s':>10}{'SSIM':>9}{'PSNR':>8}")
+    with tempfile.TemporaryDirectory(prefix="panek-calibrate-") as work_dir:
+        for name in names:
+            runs = [calibrate_run(name, media, audio, args.seconds, work_dir) for media, audio in args.sample]
+            summary = summarize(runs)
+            results["profiles"][name] = summary
+            print(f"{name:<16}{summary['encode_fps']:>12.1f}{summary['realtime']:>9.2f}x"
+                  f"{summary['bitrate_kbps']:>10.0f}{summary['ssim']:>9.4f}{summary['psnr']:>8.2f}")
+
+    caps = ffmpeg_capabilities() or {}
+    results.update(ffmpeg=caps.get("version", ""), measured=datetime.datetime.now().isoformat(timespec="seconds"))
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Saved to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,724 @@
+"""
+Panek Video Program - Core
+
+The Qt-free part of the program: constants, media utilities, ffmpeg
+capability probing and the ffmpeg command builder. Batch tools and workers
+import this module directly so they never load PySide6; the GUI in
+panek_video_program.py is built on top of it.
+
+This software uses FFmpeg (https://ffmpeg.org) licensed under the LGPL/GPL.
+"""
+
+import sys
+import os
+import re
+import json
+import math
+import shutil
+import subprocess
+from pathlib import Path
+
+# ---------- Constants ----------
+# Named encoding profiles, chosen per job. A profile sets the x264 preset,
+# quality (crf), tune and keyframe interval (gop, in frames) as well as the
+# output resolution, frame rate and audio bitrate. Still-image inputs always
+# use the stillimage tune. Measure the trade-offs on your own material with
+# panek_video_calibrate.py.
+ENCODING_PROFILES = {
+    "draft": {
+        "label": "Draft (fast preview)",
+        "preset": "veryfast", "crf": 28, "tune": None, "gop": 250,
+        "width": 1280, "height": 720, "fps": 30, "audio_bitrate": "128k",
+    },
+    "standard": {
+        "label": "Standard (1080p)",
+        "preset": "medium", "crf": 20, "tune": None, "gop": 250,
+        "width": 1920, "height": 1080, "fps": 30, "audio_bitrate": "192k",
+    },
+    "archival": {
+        "label": "Archival (high quality)",
+        "preset": "slow", "crf": 16, "tune": "film", "gop": 60,
+        "width": 1920, "height": 1080, "fps": 30, "audio_bitrate": "320k",
+    },
+    "vertical-short": {
+        "label": "Vertical Short (1080x1920)",
+        "preset": "medium", "crf": 21, "tune": None, "gop": 60,
+        "width": 1080, "height": 1920, "fps": 30, "audio_bitrate": "160k",
+    },
+}
+DEFAULT_PROFILE = "standard"
+
+# Sidecar artifacts produced alongside the main render
+CONTACT_SHEET_COLS, CONTACT_SHEET_ROWS = 4, 4
+CONTACT_SHEET_TILE_WIDTH = 320
+WAVEFORM_SIZE = "1920x240"
+
+# Resumable renders are encoded as keyframe-aligned segments of this length
+SEGMENT_SECONDS = 60
+
+# ---------- Core Utilities ----------
+
+def have(cmd: str) -> bool:
+    """Check if a command-line utility is available in the system's PATH."""
+    return shutil.which(cmd) is not None
+
+def ensure_ffmpeg():
+    """Raise a RuntimeError if ffmpeg or ffprobe are not found."""
+    if not have("ffmpeg") or not have("ffprobe"):
+        raise RuntimeError("ffmpeg and/or ffprobe not found in your system's PATH.")
+
+def sanitize_filename(name: str) -> str:
+    """Clean a string to be a valid, safe filename."""
+    name = name.strip()
+    name = re.sub(r"[^\w\-. ]+", "_", name)
+    name = re.sub(r"\s+", " ", name).strip()
+    return name or "output"
+
+def ffprobe_duration_seconds(path: str) -> float:
+    """
+    Get the duration of a media file in seconds using ffprobe.
+    This is a synchronous (blocking) call, but ffprobe is fast.
+    """
+    proc = subprocess.run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+         "-of", "default=noprint_wrappers=1:nokey=1", path],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        creationflags=no_window_flags()
+    )
+    try:
+        return float(proc.stdout.strip())
+    except Exception:
+        return 0.0
+
+def is_video_file(path: str) -> bool:
+    """Check if a file is a video file based on extension."""
+    video_extensions = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv', '.wmv', '.m4v', '.mpg', '.mpeg'}
+    return Path(path).suffix.lower() in video_extensions
+
+def render_duration_seconds(media_path: str, audio_duration: float) -> float:
+    """
+    Return how long a render will be. Renders stop at the shorter input
+    (-shortest), so a video shorter than the audio ends the render early.
+    """
+    if is_video_file(media_path):
+        video_duration = ffprobe_duration_seconds(media_path)
+        if 0 < video_duration < audio_duration:
+            return video_duration
+    return audio_duration
+
+def parse_progress_seconds(text: str):
+    """Return the latest out_time_ms from ffmpeg `-progress` output in seconds, or None."""
+    matches = re.findall(r"out_time_ms=(\d+)", text)
+    if not matches:
+        return None
+    return int(matches[-1]) / 1_000_000.0
+
+def sidecar_paths(out_path: str) -> dict:
+    """Return the artifact paths written next to a render, keyed by artifact kind."""
+    base = os.path.splitext(out_path)[0]
+    return {
+        "thumbnail": f"{base}-thumbnail.jpg",
+        "contact_sheet": f"{base}-contact-sheet.jpg",
+        "waveform": f"{base}-waveform.png",
+    }
+
+def no_window_flags() -> int:
+    """Return subprocess creation flags that suppress the console popup on Windows."""
+    if sys.platform == 'win32':
+        return subprocess.CREATE_NO_WINDOW
+    return 0
+
+# ---------- FFmpeg Capabilities ----------
+
+# Probed capabilities, keyed by resolved binary path. Each entry remembers the
+# binary's mtime so an upgraded ffmpeg is probed again.
+_capabilities_memo = {}
+
+def cache_dir() -> Path:
+    """Return the per-user cache directory, honouring PANEK_VIDEO_CACHE_DIR."""
+    override = os.environ.get("PANEK_VIDEO_CACHE_DIR")
+    if override:
+        return Path(override)
+    if sys.platform == 'win32':
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "panek-video-program"
+
+def _run_ffmpeg_info(binary: str, flag: str) -> str:
+    """Run `ffmpeg -hide_banner <flag>` and return its stdout, or None if the call failed."""
+    try:
+        proc = subprocess.run(
+            [binary, "-hide_banner", flag],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+            creationflags=no_window_flags()
+        )
+    except OSError:
+        return None
+    return proc.stdout if proc.returncode == 0 else None
+
+def _probe_capabilities(binary: str) -> dict:
+    """Ask an ffmpeg binary for its version, encoders and filters. Returns None if any probe fails."""
+    version_out = _run_ffmpeg_info(binary, "-version")
+    encoders_out = _run_ffmpeg_info(binary, "-encoders")
+    filters_out = _run_ffmpeg_info(binary, "-filters")
+    if version_out is None or encoders_out is None or filters_out is None:
+        return None
+    m = re.match(r"ffmpeg version (\S+)", version_out)
+    if not m:
+        return None
+
+    # Encoder lines look like ' V....D libx264   libx264 H.264 ...'
+    encoders = re.findall(r"^ [VAS][A-Z.]{5} (\S+)", encoders_out, re.MULTILINE)
+    # Filter lines look like ' T.C drawtext   V->V   Draw text ...'
+    filters = re.findall(r"^ [A-Z.|]{2,3} (\S+)\s+\S+->\S+", filters_out, re.MULTILINE)
+
+    return {
+        "version": m.group(1),
+        "encoders": sorted(set(encoders)),
+        "filters": sorted(set(filters)),
+    }
+
+def ffmpeg_capabilities(binary: str = "ffmpeg") -> dict:
+    """
+    Return what the local ffmpeg supports: {'path', 'mtime', 'version', 'encoders', 'filters'}.
+
+    Probing runs three ffmpeg processes, so results are cached in memory and on
+    disk per binary path + mtime. Only complete probes are cached. Returns None
+    if the binary cannot be found or cannot be probed.
+    """
+    path = shutil.which(binary)
+    if not path:
+        return None
+    path = os.path.realpath(path)
+    mtime = os.stat(path).st_mtime_ns
+
+    caps = _capabilities_memo.get(path)
+    if caps and caps["mtime"] == mtime:
+        return caps
+
+    cache_file = cache_dir() / "ffmpeg-capabilities.json"
+    try:
+        cached = json.loads(cache_file.read_text())
+    except (OSError, ValueError):
+        cached = {}
+
+    caps = cached.get(path)
+    if not caps or caps.get("mtime") != mtime:
+        probed = _probe_capabilities(path)
+        if probed is None:
+            return None  # Probe again next time rather than caching a broken result
+        caps = {"path": path, "mtime": mtime, **probed}
+        cached[path] = caps
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(".tmp")
+            tmp.write_text(json.dumps(cached, indent=2))
+            os.replace(tmp, cache_file)
+        except OSError:
+            pass  # The cache is an optimisation only
+
+    _capabilities_memo[path] = caps
+    return caps
+
+def has_filter(name: str, binary: str = "ffmpeg"):
+    """
+    Check whether the local ffmpeg was built with a given filter (e.g. drawtext).
+    Returns None if ffmpeg could not be probed, so callers only reject on a definite False.
+    """
+    caps = ffmpeg_capabilities(binary)
+    return None if caps is None else name in caps["filters"]
+
+def has_encoder(name: str, binary: str = "ffmpeg"):
+    """
+    Check whether the local ffmpeg was built with a given encoder (e.g. libx264).
+    Returns None if ffmpeg could not be probed, so callers only reject on a definite False.
+    """
+    caps = ffmpeg_capabilities(binary)
+    return None if caps is None else name in caps["encoders"]
+
+# ---------- Encoding Profiles ----------
+
+def get_profile(name: str) -> dict:
+    """Return the settings of a named encoding profile, raising ValueError for unknown names."""
+    try:
+        return ENCODING_PROFILES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown encoding profile '{name}' (choose from: {', '.join(ENCODING_PROFILES)})"
+        ) from None
+
+def calibration_path() -> Path:
+    """Return where panek_video_calibrate.py stores its measurements."""
+    return cache_dir() / "profile-calibration.json"
+
+def load_profile_calibration() -> dict:
+    """Return the measured speed/size/quality per profile name, or {} if not calibrated yet."""
+    try:
+        profiles = json.loads(calibration_path().read_text()).get("profiles", {})
+    except (OSError, ValueError, AttributeError):
+        return {}
+    return profiles if isinstance(profiles, dict) else {}
+
+# ---------- Command Builder ----------
+
+def sidecar_outputs(out_path: str, thumbnail_at, contact_sheet: bool, waveform: bool) -> dict:
+    """Return the enabled sidecar artifacts for a render, keyed by artifact kind."""
+    paths = sidecar_paths(out_path)
+    enabled = {
+        "thumbnail": thumbnail_at is not None,
+        "contact_sheet": contact_sheet,
+        "waveform": waveform,
+    }
+    return {kind: path for kind, path in paths.items() if enabled[kind]}
+
+def _escape_filter_value(value: str) -> str:
+    """
+    Escape a string for use as a filter option value inside a filter graph, so
+    it can never end the option or the filter. Two levels apply: the option
+    parser (\\ ' :) and then the graph parser (\\ ' [ ] , ;).
+    """
+    value = re.sub(r"([\\':])", r"\\\1", value)
+    return re.sub(r"([\\'\[\],;])", r"\\\1", value)
+
+def _filter_chains(text_overlay: str, text_position: str, text_size: int, text_color: str,
+                   fade_in: float, fade_out: float, media_duration: float, profile: dict) -> tuple:
+    """Return the (video, audio) filter lists for scaling, fades and the text overlay."""
+    # Build video filter chain
+    vf_filters = []
+
+    # Scaling and padding filter (works for both image and video)
+    width, height = profile["width"], profile["height"]
+    vf_filters.append(f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2")
+
+    # Add fade filters if requested
+    if fade_in > 0:
+        vf_filters.append(f"fade=t=in:st=0:d={fade_in}")
+    if fade_out > 0:
+        fade_start = max(0, media_duration - fade_out)
+        vf_filters.append(f"fade=t=out:st={fade_start}:d={fade_out}")
+
+    # Add text overlay if provided
+    if text_overlay:
+        # Escape for drawtext's own expansion (% sequences), then for the filter graph
+        safe_text = _escape_filter_value(text_overlay.replace("\\", "\\\\").replace("%", "\\%"))
+
+        # Calculate position
+        if text_position == "top":
+            x_pos, y_pos = "(w-text_w)/2", "50"
+        elif text_position == "bottom":
+            x_pos, y_pos = "(w-text_w)/2", "h-th-50"
+        else:  # center
+            x_pos, y_pos = "(w-text_w)/2", "(h-text_h)/2"
+
+        vf_filters.append(f"drawtext=text={safe_text}:fontsize={text_size}:fontcolor={text_color}:x={x_pos}:y={y_pos}")
+
+    # Build audio filter chain
+    af_filters = []
+    if fade_in > 0:
+        af_filters.append(f"afade=t=in:st=0:d={fade_in}")
+    if fade_out > 0:
+        fade_start = max(0, media_duration - fade_out)
+        af_filters.append(f"afade=t=out:st={fade_start}:d={fade_out}")
+
+    return vf_filters, af_filters
+
+def _video_codec_args(is_video: bool, profile: dict) -> list:
+    """Return the video encoder options for a profile; still images get the stillimage tune."""
+    args = ["-c:v", "libx264", "-preset", profile["preset"], "-crf", str(profile["crf"])]
+    tune = profile["tune"] if is_video else "stillimage"
+    if tune:
+        args.extend(["-tune", tune])
+    if profile["gop"]:
+        args.extend(["-g", str(profile["gop"])])
+    return args
+
+def build_ffmpeg_cmd(media_path: str, audio_path: str, out_path: str, title: str,
+                     text_overlay: str = "", text_position: str = "center", text_size: int = 48,
+                     text_color: str = "white", fade_in: float = 0.0, fade_out: float = 0.0,
+                     media_duration: float = 0.0, thumbnail_at: float = None,
+                     contact_sheet: bool = False, waveform: bool = False,
+                     profile: str = DEFAULT_PROFILE, render_duration: float = None) -> list:
+    """
+    Build the ffmpeg command list with support for video input, text overlays, and fades.
+    Encoder settings, resolution and frame rate come from the named encoding profile.
+
+    Sidecar artifacts (a still at `thumbnail_at` seconds, a contact sheet and an
+    audio waveform) are written by the same invocation from split branches of
+    the filter graph, so the inputs are only decoded once. They are timed on
+    `render_duration` (see render_duration_seconds), which defaults to
+    `media_duration`, the audio length.
+    """
+    if render_duration is None:
+        render_duration = media_duration
+
+    enc = get_profile(profile)
+    vf_filters, af_filters = _filter_chains(text_overlay, text_position, text_size, text_color,
+                                            fade_in, fade_out, media_duration, enc)
+    vf = ",".join(vf_filters)
+
+    # Check if input is video or image
+    is_video = is_video_file(media_path)
+
+    # Build command
+    cmd = ["ffmpeg", "-y"]
+
+    # Input handling: video vs image
+    if is_video:
+        cmd.extend(["-i", media_path])
+    else:
+        cmd.extend(["-loop", "1", "-i", media_path])
+
+    # Audio input
+    cmd.extend(["-i", audio_path])
+
+    # Video encoding settings
+    cmd.extend(_video_codec_args(is_video, enc))
+
+    sidecars = sidecar_outputs(out_path, thumbnail_at, contact_sheet, waveform)
+
+    if sidecars:
+        # Route everything through one filter graph and split it per output
+        graph = []
+        video_branches = ["main"] + [k for k in ("thumbnail", "contact_sheet") if k in sidecars]
+        if len(video_branches) > 1:
+            labels = "".join(f"[v_{b}]" for b in video_branches)
+            graph.append(f"[0:v]{vf},split={len(video_branches)}{labels}")
+        else:
+            graph.append(f"[0:v]{vf}[v_main]")
+
+        if "thumbnail" in sidecars:
+            # Keep the still a second inside the render so a frame always exists
+            at = max(0.0, min(thumbnail_at, render_duration - 1.0))
+            graph.append(f"[v_thumbnail]trim=start={at:.3f},setpts=PTS-STARTPTS[thumbnail]")
+
+        if "contact_sheet" in sidecars:
+            # Sample the middle of each of the evenly sized slots across the duration;
+            # eof_action=pass keeps the last sample when a video input ends
+            tiles = CONTACT_SHEET_COLS * CONTACT_SHEET_ROWS
+            interval = max(render_duration, 1.0) / tiles
+            graph.append(
+                f"[v_contact_sheet]trim=start={interval / 2:.3f},setpts=PTS-STARTPTS,"
+                f"fps=1/{interval:.3f}:eof_action=pass,scale={CONTACT_SHEET_TILE_WIDTH}:-2,"
+                f"tile={CONTACT_SHEET_COLS}x{CONTACT_SHEET_ROWS}[contact_sheet]"
+            )
+
+        af = ",".join(af_filters) or "anull"
+        if "waveform" in sidecars:
+            graph.append(f"[1:a]{af},asplit=2[a_main][a_waveform]")
+            graph.append(f"[a_waveform]showwavespic=s={WAVEFORM_SIZE}:colors=white[waveform]")
+        else:
+            graph.append(f"[1:a]{af}[a_main]")
+
+        cmd.extend(["-filter_complex", ";".join(graph), "-map", "[v_main]", "-map", "[a_main]"])
+        cmd.extend(["-r", str(enc["fps"]), "-pix_fmt", "yuv420p"])
+        cmd.extend(["-c:a", "aac", "-b:a", enc["audio_bitrate"]])
+    else:
+        # Video filters; map the streams explicitly so a video input's own
+        # audio never replaces the chosen audio file
+        cmd.extend(["-map", "0:v:0", "-map", "1:a:0"])
+        cmd.extend(["-vf", vf, "-r", str(enc["fps"]), "-pix_fmt", "yuv420p"])
+
+        # Audio encoding and filters
+        cmd.extend(["-c:a", "aac", "-b:a", enc["audio_bitrate"]])
+        if af_filters:
+            cmd.extend(["-af", ",".join(af_filters)])
+
+    cmd.extend(["-shortest"])
+
+    # Optimization and metadata
+    cmd.extend([
+        "-movflags", "+faststart",
+        "-color_primaries", "bt709", "-color_trc", "bt709", "-colorspace", "bt709",
+        "-metadata", f"title={title}",
+        "-progress", "pipe:1",
+        out_path
+    ])
+
+    # Sidecar outputs, each a single image from its own graph branch
+    for kind, path in sidecars.items():
+        cmd.extend(["-map", f"[{kind}]", "-frames:v", "1"])
+        if path.endswith(".jpg"):
+            cmd.extend(["-q:v", "2"])
+        cmd.append(path)
+
+    return cmd
+
+# ---------- Resumable Renders ----------
+#
+# A resumable render encodes into <output>.parts/ as numbered Matroska
+# segments with a keyframe at every boundary, then stream-copies them into
+# the final file. journal.json records the render settings and every segment
+# that is known to be complete. ffmpeg's own segment lists
+# (segments-NNNNN.csv) record each segment as it is closed, with its start
+# and end time. A step that exits cleanly has its segments recorded straight
+# away (record_segment_run). After a crash, pause or cancel, the listed
+# segments are checked by size and listed duration instead, so resuming
+# never has to run ffprobe over hundreds of files.
+
+def resumable_parts_dir(out_path: str) -> str:
+    """Return the working folder that holds a resumable render's segments and journal."""
+    return out_path + ".parts"
+
+def _segment_path(parts_dir: str, index: int) -> str:
+    return os.path.join(parts_dir, f"seg_{index:05d}.mkv")
+
+def _expected_segment_seconds(index: int, duration: float, segment_seconds: float) -> float:
+    return min(segment_seconds, duration - index * segment_seconds)
+
+def _file_signature(path: str) -> list:
+    """Size and mtime of an input, so a changed source invalidates old segments."""
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def load_journal(parts_dir: str) -> dict:
+    """Read a render journal, or return None if there is no readable one."""
+    try:
+        with open(os.path.join(parts_dir, "journal.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_journal(parts_dir: str, journal: dict):
+    """Write the render journal atomically."""
+    path = os.path.join(parts_dir, "journal.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(journal, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def _read_segment_list(path: str) -> dict:
+    """Parse one ffmpeg segment list into {index: listed duration in seconds}."""
+    listed = {}
+    try:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                m = re.match(r"seg_(\d+)\.mkv,([\d.]+),([\d.]+)", line)
+                if m:
+                    listed[int(m.group(1))] = float(m.group(3)) - float(m.group(2))
+    except OSError:
+        pass
+    return listed
+
+def _listed_segments(parts_dir: str) -> dict:
+    """
+    Segments that ffmpeg reported as closed in any of its segment lists, as
+    {index: listed duration}. Newer lists win, since a range can be re-encoded.
+    """
+    lists = [os.path.join(parts_dir, name) for name in os.listdir(parts_dir)
+             if name.startswith("segments-") and name.endswith(".csv")]
+    listed = {}
+    for path in sorted(lists, key=os.path.getmtime):
+        listed.update(_read_segment_list(path))
+    return listed
+
+def verify_segments(parts_dir: str, journal: dict) -> set:
+    """
+    Return the indices of segments that are complete, updating the journal.
+
+    A recorded segment counts while its file keeps the recorded size. A
+    segment that is only listed (its encode was interrupted) counts when it
+    is no more than one frame shorter than planned; a pause or crash can
+    close the last segment early, and accepting that would drop those
+    frames from the joined video.
+    """
+    duration, seg_len = journal["duration"], journal["segment_seconds"]
+    tolerance = 1.0 / journal["params"]["encode"]["fps"]
+    recorded = journal.setdefault("segments", {})
+    listed = _listed_segments(parts_dir)
+    done = set()
+    for index in sorted(set(listed) | {int(i) for i in recorded}):
+        if index >= journal["count"]:
+            continue
+        path = _segment_path(parts_dir, index)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        entry = recorded.get(str(index))
+        if entry and size and entry["size"] == size:
+            done.add(index)
+            continue
+
+        expected = _expected_segment_seconds(index, duration, seg_len)
+        actual = listed.get(index, 0.0)
+        if size and actual >= expected - tolerance:
+            recorded[str(index)] = {"size": size, "duration": actual}
+            done.add(index)
+        else:
+            recorded.pop(str(index), None)
+    save_journal(parts_dir, journal)
+    return done
+
+def record_segment_run(parts_dir: str, first: int, end: int) -> set:
+    """
+    Record the segments of an encode step that exited cleanly, so they are
+    never checked again. Returns the recorded indices.
+
+    A clean exit means every segment ffmpeg listed is complete. If the step
+    listed fewer segments than planned, the inputs ended early, and the
+    render is shortened to what was written.
+    """
+    journal = load_journal(parts_dir)
+    if journal is None:
+        raise RuntimeError(f"The render journal in {parts_dir} is missing or unreadable.")
+    listed = _read_segment_list(os.path.join(parts_dir, f"segments-{first:05d}.csv"))
+    indices = {index for index in listed if first <= index < end}
+    for index in indices:
+        path = _segment_path(parts_dir, index)
+        if os.path.exists(path):
+            journal["segments"][str(index)] = {"size": os.path.getsize(path), "duration": listed[index]}
+    last = max(indices, default=first - 1)
+    if last + 1 < end:
+        journal["count"] = min(journal["count"], last + 1)
+    save_journal(parts_dir, journal)
+    return indices
+
+def _missing_runs(done: set, count: int) -> list:
+    """Group the missing segment indices into contiguous (first, end) ranges."""
+    runs, first = [], None
+    for index in range(count + 1):
+        missing = index < count and index not in done
+        if missing and first is None:
+            first = index
+        elif not missing and first is not None:
+            runs.append((first, index))
+            first = None
+    return runs
+
+def build_segment_cmd(media_path: str, audio_path: str, parts_dir: str, first: int, end: int,
+                      text_overlay: str = "", text_position: str = "center", text_size: int = 48,
+                      text_color: str = "white", fade_in: float = 0.0, fade_out: float = 0.0,
+                      media_duration: float = 0.0, profile: str = DEFAULT_PROFILE,
+                      segment_seconds: float = SEGMENT_SECONDS) -> list:
+    """
+    Build the ffmpeg command that encodes segments first..end-1 of a resumable render.
+
+    The inputs are seeked to the first segment and timestamps are shifted back
+    to the full timeline inside the filter graph, so fades land where they
+    would in a single-pass render.
+    """
+    start = first * segment_seconds
+    length = min(end * segment_seconds, media_duration) - start
+
+    enc = get_profile(profile)
+    vf_filters, af_filters = _filter_chains(text_overlay, text_position, text_size, text_color,
+                                            fade_in, fade_out, media_duration, enc)
+    vf = ",".join([f"setpts=PTS+{start}/TB"] + vf_filters + ["setpts=PTS-STARTPTS"])
+    af = ",".join([f"asetpts=PTS+{start}/TB"] + af_filters + ["asetpts=PTS-STARTPTS"])
+
+    is_video = is_video_file(media_path)
+    cmd = ["ffmpeg", "-y"]
+    if is_video:
+        cmd.extend(["-ss", str(start), "-i", media_path])
+    else:
+        cmd.extend(["-loop", "1", "-i", media_path])
+    cmd.extend(["-ss", str(start), "-i", audio_path])
+
+    cmd.extend(["-map", "0:v:0", "-map", "1:a:0"])
+    cmd.extend(_video_codec_args(is_video, enc))
+    cmd.extend(["-vf", vf, "-r", str(enc["fps"]), "-pix_fmt", "yuv420p",
+                "-force_key_frames", f"expr:gte(t,n_forced*{segment_seconds})"])
+    cmd.extend(["-c:a", "aac", "-b:a", enc["audio_bitrate"], "-af", af])
+    cmd.extend(["-t", f"{length:.3f}", "-shortest"])
+    cmd.extend([
+        "-color_primaries", "bt709", "-color_trc", "bt709", "-colorspace", "bt709",
+        "-f", "segment", "-segment_time", str(segment_seconds),
+        "-segment_start_number", str(first), "-reset_timestamps", "1",
+        "-segment_format", "matroska",
+        "-segment_list", os.path.join(parts_dir, f"segments-{first:05d}.csv"),
+        "-segment_list_type", "csv",
+        "-progress", "pipe:1",
+        os.path.join(parts_dir, "seg_%05d.mkv")
+    ])
+    return cmd
+
+def build_join_cmd(parts_dir: str, out_path: str, title: str) -> list:
+    """
+    Build the stream-copy command that joins all segments into the final video.
+
+    Raises RuntimeError if any planned segment is not recorded in the journal
+    or its file has changed, rather than letting the join fail or come out short.
+    """
+    journal = load_journal(parts_dir)
+    if journal is None:
+        raise RuntimeError(f"The render journal in {parts_dir} is missing or unreadable.")
+    recorded = journal.get("segments", {})
+    missing = []
+    for index in range(journal["count"]):
+        path = _segment_path(parts_dir, index)
+        entry = recorded.get(str(index))
+        if not entry or not os.path.exists(path) or os.path.getsize(path) != entry["size"]:
+            missing.append(index)
+    if missing or not journal["count"]:
+        names = ", ".join(os.path.basename(_segment_path(parts_dir, i)) for i in missing[:5])
+        more = f" and {len(missing) - 5} more" if len(missing) > 5 else ""
+        raise RuntimeError(f"Cannot join the render, segments are missing: {names or 'all'}{more}. "
+                           "Start the render again to encode them.")
+
+    list_path = os.path.join(parts_dir, "concat.txt")
+    with open(list_path, "w", encoding="utf-8") as f:
+        for index in range(journal["count"]):
+            f.write(f"file '{os.path.basename(_segment_path(parts_dir, index))}'\n")
+    return [
+        "ffmpeg", "-y", "-f", "concat", "-safe", "0", "-i", list_path,
+        "-c", "copy",
+        "-movflags", "+faststart",
+        "-metadata", f"title={title}",
+        "-progress", "pipe:1",
+        out_path
+    ]
+
+def plan_resumable_render(media_path: str, audio_path: str, out_path: str, title: str,
+                          text_overlay: str = "", text_position: str = "center", text_size: int = 48,
+                          text_color: str = "white", fade_in: float = 0.0, fade_out: float = 0.0,
+                          media_duration: float = 0.0, profile: str = DEFAULT_PROFILE,
+                          segment_seconds: float = SEGMENT_SECONDS) -> dict:
+    """
+    Work out what is left to do for a resumable render.
+
+    Reuses the journal in <output>.parts/ when it was written for the same
+    inputs and settings, otherwise starts over. Returns a dict with
+    'parts_dir', 'count', 'duration' (seconds the render will last), 'done'
+    (finished segment indices), 'done_seconds', 'steps', a list of
+    (command, seconds_done_before_step) encoding the missing segments, and
+    'runs', the (first, end) segment range of each step.
+
+    After each step exits cleanly, pass its run to record_segment_run(); once
+    all steps are done, build_join_cmd() produces the final join.
+    """
+    parts_dir = resumable_parts_dir(out_path)
+    params = {
+        "media": [os.path.abspath(media_path)] + _file_signature(media_path),
+        "audio": [os.path.abspath(audio_path)] + _file_signature(audio_path),
+        "text": [text_overlay, text_position, text_size, text_color],
+        "fades": [fade_in, fade_out],
+        "encode": dict(get_profile(profile), name=profile),
+    }
+
+    journal = load_journal(parts_dir)
+    if not journal or journal.get("params") != params or journal.get("segment_seconds") != segment_seconds:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+        journal = None
+    os.makedirs(parts_dir, exist_ok=True)
+    if journal is None:
+        # Segments cover the render as it will come out, not the audio
+        duration = render_duration_seconds(media_path, media_duration)
+        journal = {"params": params, "segment_seconds": segment_seconds, "duration": duration,
+                   "count": max(1, math.ceil(duration / segment_seconds)), "segments": {}}
+        save_journal(parts_dir, journal)
+    duration, count = journal["duration"], journal["count"]
+
+    done = verify_segments(parts_dir, journal)
+    done_seconds = sum(_expected_segment_seconds(i, duration, segment_seconds) for i in done)
+
+    steps, runs, base = [], _missing_runs(done, count), done_seconds
+    for first, end in runs:
+        # Drop stale files from an interrupted encode of this range
+        for index in range(first, end):
+            if os.path.exists(_segment_path(parts_dir, index)):
+                os.remove(_segment_path(parts_dir, index))
+        cmd = build_segment_cmd(media_path, audio_path, parts_dir, first, end,
+                                text_overlay, text_position, text_size, text_color,
+                                fade_in, fade_out, media_duration, profile, segment_seconds)
+        steps.append((cmd, base))
+        base += min(end * segment_seconds, duration) - first * segment_seconds
+
+    return {"parts_dir": parts_dir, "count": count, "duration": duration, "done": done,
+            "done_seconds": done_seconds, "steps": steps, "runs": runs}
@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+Panek Video Program - Render Farm
+
+A small coordinator/worker mode for rendering many videos across several
+processes or machines. It uses only the standard library and the Qt-free
+core, so workers never load PySide6.
+
+- The coordinator holds the job queue and serves a JSON-over-HTTP API.
+- Workers lease a job, render it with the same command builder as the GUI,
+  report progress in heartbeats and copy the results to a shared folder.
+- A lease that misses its heartbeats (dead or disconnected worker) expires
+  and the job goes back on the queue.
+
+Usage:
+    # Everything on one machine, with 3 worker processes
+    python panek_video_farm.py local --workers 3 --results-dir out/ jobs.json
+
+    # Production: one coordinator, workers on other machines
+    export PANEK_FARM_TOKEN=<shared secret>
+    python panek_video_farm.py coordinator --host 0.0.0.0 --results-dir /mnt/renders
+    python panek_video_farm.py worker --coordinator http://render-host:8765
+    python panek_video_farm.py submit --coordinator http://render-host:8765 jobs.json
+    python panek_video_farm.py status --coordinator http://render-host:8765
+
+A manifest is a JSON list of jobs (or {"jobs": [...]}) using the GUI's
+render options, e.g. [{"media": "cover.png", "audio": "song.mp3",
+"title": "Song", "profile": "vertical-short", "waveform": true}]. Relative paths are
+resolved against the manifest's folder. Media, audio and the results
+folder must be reachable at the same paths on every worker.
+
+Jobs choose input and output paths on the workers, so a coordinator that
+listens on anything but loopback requires a shared token (--token or
+PANEK_FARM_TOKEN) from every client.
+
+This software uses FFmpeg (https://ffmpeg.org) licensed under the LGPL/GPL.
+"""
+
+import sys
+import os
+import re
+import hmac
+import json
+import math
+import time
+import uuid
+import shutil
+import ipaddress
+import argparse
+import platform
+import tempfile
+import threading
+import subprocess
+import urllib.request
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from panek_video_core import (
+    DEFAULT_PROFILE, ensure_ffmpeg, sanitize_filename, ffprobe_duration_seconds, no_window_flags,
+    has_encoder, has_filter, render_duration_seconds, parse_progress_seconds,
+    sidecar_paths, sidecar_outputs, get_profile, build_ffmpeg_cmd
+)
+
+# ---------- Constants ----------
+DEFAULT_PORT = 8765
+LEASE_SECONDS = 30       # A job is requeued if its worker is silent this long
+MAX_ATTEMPTS = 3         # Lease expiries/failures before a job is marked failed
+POLL_SECONDS = 2.0       # Worker back-off when the queue is empty
+
+# Render options a job may set, with the GUI's defaults
+JOB_DEFAULTS = {
+    "title": "",
+    "text_overlay": "",
+    "text_position": "center",
+    "text_size": 48,
+    "text_color": "white",
+    "fade_in": 0.0,
+    "fade_out": 0.0,
+    "thumbnail_at": None,
+    "contact_sheet": False,
+    "waveform": False,
+    "profile": DEFAULT_PROFILE,
+}
+TEXT_POSITIONS = ("top", "center", "bottom")
+TEXT_SIZE_RANGE = (12, 200)  # Same limits as the GUI's text size box
+
+# ---------- Manifest ----------
+
+def normalize_job(spec: dict, base_dir: str = ".") -> dict:
+    """Validate a job spec, fill in defaults and make its paths absolute."""
+    if not isinstance(spec, dict):
+        raise ValueError(f"Job must be an object, got: {spec!r}")
+    unknown = set(spec) - set(JOB_DEFAULTS) - {"media", "audio", "output_dir"}
+    if unknown:
+        raise ValueError(f"Unknown job option(s): {', '.join(sorted(unknown))}")
+    for key in ("media", "audio"):
+        if not spec.get(key):
+            raise ValueError(f"Job is missing '{key}': {spec!r}")
+
+    job = {**JOB_DEFAULTS, **spec}
+    _validate_options(job)
+    job["media"] = os.path.abspath(os.path.join(base_dir, job["media"]))
+    job["audio"] = os.path.abspath(os.path.join(base_dir, job["audio"]))
+    if job.get("output_dir"):
+        job["output_dir"] = os.path.abspath(os.path.join(base_dir, job["output_dir"]))
+    return job
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def _validate_options(job: dict):
+    """Raise ValueError unless every render option has the type and range the GUI would produce."""
+    for key in ("media", "audio", "title", "text_overlay", "profile"):
+        if not isinstance(job[key], str):
+            raise ValueError(f"'{key}' must be a string, got: {job[key]!r}")
+    if job.get("output_dir") is not None and not isinstance(job["output_dir"], str):
+        raise ValueError(f"'output_dir' must be a string, got: {job['output_dir']!r}")
+    if job["text_position"] not in TEXT_POSITIONS:
+        raise ValueError(f"'text_position' must be one of {', '.join(TEXT_POSITIONS)}, got: {job['text_position']!r}")
+    low, high = TEXT_SIZE_RANGE
+    size = job["text_size"]
+    if not (isinstance(size, int) and not isinstance(size, bool) and low <= size <= high):
+        raise ValueError(f"'text_size' must be a whole number from {low} to {high}, got: {size!r}")
+    # A color name or hex code; anything else could smuggle options into the filter graph
+    if not (isinstance(job["text_color"], str) and re.fullmatch(r"#?[0-9A-Za-z]+", job["text_color"])):
+        raise ValueError(f"'text_color' must be a color name or hex code, got: {job['text_color']!r}")
+    for key in ("fade_in", "fade_out"):
+        if not (_is_number(job[key]) and job[key] >= 0):
+            raise ValueError(f"'{key}' must be a number of seconds >= 0, got: {job[key]!r}")
+    if job["thumbnail_at"] is not None and not (_is_number(job["thumbnail_at"]) and job["thumbnail_at"] >= 0):
+        raise ValueError(f"'thumbnail_at' must be null or a number of seconds >= 0, got: {job['thumbnail_at']!r}")
+    for key in ("contact_sheet", "waveform"):
+        if not isinstance(job[key], bool):
+            raise ValueError(f"'{key}' must be true or false, got: {job[key]!r}")
+    get_profile(job["profile"])  # Raises ValueError for unknown profiles
+
+def load_manifest(path: str) -> list:
+    """Read a manifest file and return its normalized job specs."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        data = data.get("jobs", [])
+    base_dir = os.path.dirname(os.path.abspath(path))
+    return [normalize_job(spec, base_dir) for spec in data]
+
+# ---------- Coordinator ----------
+
+class JobQueue:
+    """
+    Thread-safe job queue with time-limited leases.
+
+    A job moves queued -> running -> done/failed. Running jobs hold a lease
+    that the worker renews with heartbeats; expired leases are requeued until
+    the job has used up MAX_ATTEMPTS.
+    """
+    def __init__(self, results_dir: str, lease_seconds: float = LEASE_SECONDS,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.results_dir = os.path.abspath(results_dir)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.jobs = {}          # job_id -> job record
+        self.pending = deque()  # job_ids waiting for a worker
+        self.lock = threading.Lock()
+
+    def submit(self, spec: dict) -> str:
+        """Queue a normalized job spec and return its id."""
+        job_id = uuid.uuid4().hex[:12]
+        with self.lock:
+            self.jobs[job_id] = {
+                "id": job_id, "spec": spec, "status": "queued", "attempts": 0,
+                "worker": None, "lease": None, "expires": 0.0, "progress": 0,
+                "result": None, "error": "", "submitted": time.time(),
+            }
+            self.pending.append(job_id)
+        return job_id
+
+    def lease(self, worker: str):
+        """Hand the next queued job to a worker, or return None if the queue is empty."""
+        with self.lock:
+            self._requeue_expired()
+            if not self.pending:
+                return None
+            job = self.jobs[self.pending.popleft()]
+            job.update(status="running", worker=worker, lease=uuid.uuid4().hex,
+                       expires=time.time() + self.lease_seconds, progress=0)
+            job["attempts"] += 1
+            return {
+                "id": job["id"], "lease": job["lease"], "spec": job["spec"],
+                "lease_seconds": self.lease_seconds,
+                "results_dir": job["spec"].get("output_dir") or self.results_dir,
+            }
+
+    def _holds_lease(self, job: dict, lease: str) -> bool:
+        """Check a lease is current; an expired one is void even before the reaper requeues it."""
+        return (job is not None and job["status"] == "running" and job["lease"] == lease
+                and job["expires"] >= time.time())
+
+    def heartbeat(self, job_id: str, lease: str, progress: int) -> bool:
+        """Renew a lease and record progress. False means the lease is gone."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not self._holds_lease(job, lease):
+                return False
+            job["expires"] = time.time() + self.lease_seconds
+            job["progress"] = max(0, min(100, int(progress)))
+            return True
+
+    def complete(self, job_id: str, lease: str, exit_code: int, result: dict, error: str = "") -> bool:
+        """Record a worker's outcome for the job it holds a lease on."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not self._holds_lease(job, lease):
+                return False
+            job.update(lease=None, result=result, error=error)
+            if exit_code == 0:
+                job.update(status="done", progress=100)
+            elif job["attempts"] < self.max_attempts:
+                job["status"] = "queued"
+                self.pending.append(job_id)
+            else:
+                job["status"] = "failed"
+            return True
+
+    def requeue_expired(self):
+        """Requeue jobs whose worker stopped sending heartbeats."""
+        with self.lock:
+            self._requeue_expired()
+
+    def _requeue_expired(self):
+        now = time.time()
+        for job in self.jobs.values():
+            if job["status"] == "running" and job["expires"] < now:
+                job.update(error=f"Lease expired on worker {job['worker']}", lease=None, progress=0)
+                if job["attempts"] < self.max_attempts:
+                    job["status"] = "queued"
+                    self.pending.append(job["id"])
+                else:
+                    job["status"] = "failed"
+
+    def snapshot(self) -> list:
+        """Return a copy of all job records, oldest first."""
+        with self.lock:
+            return [dict(job) for job in sorted(self.jobs.values(), key=lambda j: j["submitted"])]
+
+class CoordinatorHandler(BaseHTTPRequestHandler):
+    """JSON API for the job queue. The server instance carries `queue` and `token`."""
+
+    def log_message(self, format, *args):
+        pass  # Keep the console for job events only
+
+    def _send(self, status: int, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get("X-Panek-Token", ""), token):
+            self._send(403, {"error": "invalid token"})
+            return False
+        return True
+
+    def do_GET(self):
+        if not self._authorized():
+            return
+        if self.path == "/jobs":
+            self._send(200, {"jobs": self.server.queue.snapshot()})
+        else:
+            self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": "invalid JSON"})
+            return
+
+        queue = self.server.queue
+        try:
+            if self.path == "/jobs":
+                specs = [normalize_job(spec) for spec in data.get("jobs", [])]
+                self._send(200, {"ids": [queue.submit(spec) for spec in specs]})
+            elif self.path == "/lease":
+                job = queue.lease(str(data.get("worker", "unknown")))
+                if job:
+                    print(f"[coordinator] job {job['id']} -> {data.get('worker')}", flush=True)
+                self._send(200, {"job": job})
+            elif self.path == "/heartbeat":
+                ok = queue.heartbeat(data["id"], data["lease"], data.get("progress", 0))
+                self._send(200, {"ok": ok})
+            elif self.path == "/complete":
+                ok = queue.complete(data["id"], data["lease"], int(data["exit_code"]),
+                                    data.get("result") or {}, data.get("error", ""))
+                if ok:
+                    print(f"[coordinator] job {data['id']} finished (code {data['exit_code']})", flush=True)
+                else:
+                    print(f"[coordinator] job {data['id']}: rejected result (code {data['exit_code']}), "
+                          "lease expired or superseded", flush=True)
+                self._send(200, {"ok": ok})
+            else:
+                self._send(404, {"error": "not found"})
+        except (KeyError, TypeError, ValueError) as e:
+            self._send(400, {"error": str(e)})
+
+def start_coordinator(host: str, port: int, results_dir: str, token: str = "",
+                      lease_seconds: float = LEASE_SECONDS) -> ThreadingHTTPServer:
+    """Start the coordinator API and lease reaper on background threads."""
+    server = ThreadingHTTPServer((host, port), CoordinatorHandler)
+    server.queue = JobQueue(results_dir, lease_seconds)
+    server.token = token
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def reap():
+        while True:
+            time.sleep(lease_seconds / 3)
+            server.queue.requeue_expired()
+    threading.Thread(target=reap, daemon=True).start()
+    return server
+
+# ---------- Worker ----------
+
+class CoordinatorClient:
+    """Minimal JSON client for the coordinator API."""
+    def __init__(self, url: str, token: str = "", timeout: float = 10.0):
+        self.url = url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+
+    def call(self, path: str, payload: dict = None) -> dict:
+        data = None if payload is None else json.dumps(payload).encode()
+        req = urllib.request.Request(self.url + path, data=data,
+                                     headers={"Content-Type": "application/json"})
+        if self.token:
+            req.add_header("X-Panek-Token", self.token)
+        with urllib.request.urlopen(req, timeout=self.timeout) as resp:
+            return json.loads(resp.read())
+
+def upload(src: str, dest: str, tag: str, replace: bool = False) -> str:
+    """
+    Copy a finished file to `dest` in the shared results folder and return `dest`.
+
+    Unless `replace` is set, an existing result is never replaced: the name is
+    claimed with an exclusive create first (FileExistsError if it is taken).
+    The copy goes through a temp file named with `tag` (job id and lease), so
+    concurrent uploads cannot clobber each other.
+    """
+    if not replace:
+        with open(dest, "xb"):
+            pass
+    partial = f"{dest}.{tag}.part"
+    try:
+        shutil.copyfile(src, partial)
+        os.replace(partial, dest)
+    except BaseException:
+        for path in [partial] if replace else [partial, dest]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        raise
+    return dest
+
+def render_job(client: CoordinatorClient, job: dict, worker: str, scratch_dir: str):
+    """Render one leased job, streaming progress to the coordinator. Returns (exit_code, result, error)."""
+    spec = job["spec"]
+    duration = ffprobe_duration_seconds(spec["audio"])
+    if duration == 0.0:
+        return -1, {}, "Could not determine audio duration or audio is 0s long."
+    if spec["text_overlay"] and has_filter("drawtext") is False:
+        return -1, {}, f"ffmpeg on worker {worker} has no drawtext filter, so text overlays are unavailable."
+
+    title = sanitize_filename(spec["title"] or f"panek-video-{job['id']}")
+    work_dir = tempfile.mkdtemp(prefix=f"panek-{job['id']}-", dir=scratch_dir)
+    out_path = os.path.join(work_dir, f"{title}.mp4")
+    cmd = build_ffmpeg_cmd(
+        spec["media"], spec["audio"], out_path, title,
+        spec["text_overlay"], spec["text_position"], spec["text_size"], spec["text_color"],
+        spec["fade_in"], spec["fade_out"], duration,
+        spec["thumbnail_at"], spec["contact_sheet"], spec["waveform"], spec["profile"],
+        render_duration_seconds(spec["media"], duration)
+    )
+
+    progress = [0]
+    lease_lost = threading.Event()
+    done = threading.Event()
+    log_path = os.path.join(work_dir, "ffmpeg.log")
+    try:
+        with open(log_path, "w") as log:
+            proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=log, text=True,
+                                    creationflags=no_window_flags())
+
+            def beat():
+                # Renew the lease well before it expires, through the render and the
+                # upload; stop if it was taken away
+                while not done.wait(job["lease_seconds"] / 3):
+                    try:
+                        ok = client.call("/heartbeat", {"id": job["id"], "lease": job["lease"],
+                                                        "progress": progress[0]})["ok"]
+                    except (OSError, ValueError):
+                        continue  # Coordinator unreachable; keep trying until the lease runs out
+                    if not ok:
+                        lease_lost.set()
+                        proc.terminate()
+                        return
+            threading.Thread(target=beat, daemon=True).start()
+
+            for line in proc.stdout:
+                current = parse_progress_seconds(line)
+                if current is not None:
+                    progress[0] = int(min(100, current / duration * 100))
+            exit_code = proc.wait()
+
+        if lease_lost.is_set():
+            return None, {}, "Lease lost"
+        if exit_code != 0:
+            with open(log_path, errors="ignore") as log:
+                tail = log.read()[-2000:]
+            return exit_code, {}, tail
+
+        # Upload the video and any artifacts that were written. Other results are
+        # never replaced; if a name is taken (another job with the same title, or
+        # an earlier attempt of this one), the job id is added to all of them.
+        # Names carrying the job id belong to this job, so whatever is already
+        # there is an earlier attempt's output and is replaced.
+        results_dir = job["results_dir"]
+        os.makedirs(results_dir, exist_ok=True)
+        sidecars = sidecar_outputs(out_path, spec["thumbnail_at"], spec["contact_sheet"], spec["waveform"])
+        written = {kind: path for kind, path in sidecars.items() if os.path.exists(path)}
+        dest = os.path.join(results_dir, os.path.basename(out_path))
+        replace = False
+        if any(os.path.exists(path) for path in [dest] + [sidecar_paths(dest)[kind] for kind in written]):
+            dest = os.path.join(results_dir, f"{title}-{job['id']}.mp4")
+            replace = True
+        tag = f"{job['id']}-{job['lease'][:8]}"
+
+        uploads = [("output", out_path, dest)]
+        uploads += [(kind, path, sidecar_paths(dest)[kind]) for kind, path in written.items()]
+        result = {"output": "", "artifacts": {}, "worker": worker}
+        for kind, src, target in uploads:
+            if lease_lost.is_set():
+                return None, {}, "Lease lost during upload"
+            if kind == "output":
+                result["output"] = upload(src, target, tag, replace)
+            else:
+                result["artifacts"][kind] = upload(src, target, tag, replace)
+        return 0, result, ""
+    finally:
+        done.set()  # Heartbeats stop only once the upload is over
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def ensure_encoder():
+    """Raise RuntimeError if the local ffmpeg has no libx264, which every encoding profile uses."""
+    if has_encoder("libx264") is False:
+        raise RuntimeError("This ffmpeg build has no libx264 encoder, which every encoding profile uses.")
+
+def run_worker(coordinator: str, token: str = "", worker: str = "", scratch_dir: str = None,
+               poll_seconds: float = POLL_SECONDS, once: bool = False):
+    """Lease and render jobs until interrupted (or until the queue is empty with `once`)."""
+    client = CoordinatorClient(coordinator, token)
+    worker = worker or f"{platform.node() or 'worker'}-{os.getpid()}"
+    while True:
+        try:
+            job = client.call("/lease", {"worker": worker})["job"]
+        except (OSError, ValueError) as e:
+            print(f"[{worker}] coordinator unreachable: {e}", flush=True)
+            time.sleep(poll_seconds)
+            continue
+        if not job:
+            if once:
+                return
+            time.sleep(poll_seconds)
+            continue
+
+        print(f"[{worker}] rendering job {job['id']}", flush=True)
+        try:
+            exit_code, result, error = render_job(client, job, worker, scratch_dir)
+        except Exception as e:
+            # Report a bad job instead of dying on it, so it fails after MAX_ATTEMPTS
+            exit_code, result, error = -1, {}, f"Worker error: {type(e).__name__}: {e}"
+        if exit_code is None:
+            print(f"[{worker}] lease lost for job {job['id']}, dropping it", flush=True)
+            continue
+        try:
+            ok = client.call("/complete", {"id": job["id"], "lease": job["lease"], "exit_code": exit_code,
+                                           "result": result, "error": error})["ok"]
+        except (OSError, ValueError, KeyError) as e:
+            # The lease will expire and the job will be retried elsewhere
+            print(f"[{worker}] could not report job {job['id']}: {e}", flush=True)
+            continue
+        if not ok:
+            print(f"[{worker}] lease lost for job {job['id']}; the coordinator did not accept the result",
+                  flush=True)
+
+# ---------- Command Line ----------
+
+def print_status(jobs: list):
+    """Print one line per job."""
+    for job in jobs:
+        line = f"{job['id']}  {job['status']:<8} {job['progress']:>3}%  {job['spec']['title'] or job['spec']['media']}"
+        if job["status"] == "done":
+            line += f"  -> {job['result']['output']}"
+        elif job["error"]:
+            line += f"  ({job['error'].strip().splitlines()[-1]})"
+        print(line)
+
+def cmd_local(args):
+    """Run a coordinator and several worker processes on this machine until the manifest is done."""
+    specs = load_manifest(args.manifest)
+    server = start_coordinator("127.0.0.1", args.port, args.results_dir, lease_seconds=args.lease_seconds)
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    for spec in specs:
+        server.queue.submit(spec)
+
+    workers = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", "--coordinator", url,
+                          "--name", f"local-{i + 1}"])
+        for i in range(args.workers)
+    ]
+    try:
+        while any(job["status"] in ("queued", "running") for job in server.queue.snapshot()):
+            if all(proc.poll() is not None for proc in workers):
+                print("All workers have exited; stopping with jobs still queued.", file=sys.stderr, flush=True)
+                break
+            time.sleep(1)
+    finally:
+        for proc in workers:
+            proc.terminate()
+        server.shutdown()
+
+    jobs = server.queue.snapshot()
+    print_status(jobs)
+    return 0 if all(job["status"] == "done" for job in jobs) else 1
+
+def _is_loopback(host: str) -> bool:
+    """Check whether a bind address only accepts connections from this machine."""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Panek Video Program render farm")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("coordinator", help="hold the job queue and serve the farm API")
+    p.add_argument("--host", default="127.0.0.1",
+                   help="bind address (0.0.0.0 to accept remote workers; requires --token)")
+    p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    p.add_argument("--results-dir", required=True, help="shared folder workers upload results to")
+    p.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    p.add_argument("--token", default=os.environ.get("PANEK_FARM_TOKEN", ""), help="shared secret for API calls")
+
+    p = sub.add_parser("worker", help="lease and render jobs from a coordinator")
+    p.add_argument("--coordinator", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    p.add_argument("--token", default=os.environ.get("PANEK_FARM_TOKEN", ""))
+    p.add_argument("--name", default="", help="worker name shown in job status")
+    p.add_argument("--scratch-dir", default=None, help="local folder for in-progress renders")
+    p.add_argument("--once", action="store_true", help="exit when the queue is empty")
+
+    p = sub.add_parser("submit", help="queue the jobs in a manifest")
+    p.add_argument("manifest")
+    p.add_argument("--coordinator", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    p.add_argument("--token", default=os.environ.get("PANEK_FARM_TOKEN", ""))
+
+    p = sub.add_parser("status", help="show the job queue")
+    p.add_argument("--coordinator", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    p.add_argument("--token", default=os.environ.get("PANEK_FARM_TOKEN", ""))
+
+    p = sub.add_parser("local", help="run a coordinator plus worker processes on this machine")
+    p.add_argument("manifest")
+    p.add_argument("--workers", type=int, default=2)
+    p.add_argument("--results-dir", required=True)
+    p.add_argument("--port", type=int, default=0, help="coordinator port (default: any free port)")
+    p.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "coordinator":
+        if not args.token and not _is_loopback(args.host):
+            parser.error("a --token (or PANEK_FARM_TOKEN) is required when listening on a non-loopback address")
+        server = start_coordinator(args.host, args.port, args.results_dir, args.token, args.lease_seconds)
+        print(f"Coordinator listening on http://{args.host}:{server.server_address[1]}", flush=True)
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            server.shutdown()
+        return 0
+    if args.command == "worker":
+        ensure_ffmpeg()
+        ensure_encoder()  # Refuse to lease jobs this worker could only fail
+        try:
+            run_worker(args.coordinator, args.token, args.name, args.scratch_dir, once=args.once)
+        except KeyboardInterrupt:
+            pass
+        return 0
+    if args.command == "submit":
+        specs = load_manifest(args.manifest)
+        ids = CoordinatorClient(args.coordinator, args.token).call("/jobs", {"jobs": specs})["ids"]
+        print("\n".join(ids))
+        return 0
+    if args.command == "status":
+        print_status(CoordinatorClient(args.coordinator, args.token).call("/jobs")["jobs"])
+        return 0
+    if args.command == "local":
+        ensure_ffmpeg()
+        ensure_encoder()
+        return cmd_local(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
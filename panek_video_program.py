@@ -22,10 +22,8 @@ This software uses FFmpeg (https://ffmpeg.org) licensed under the LGPL/GPL.
 
 import sys
 import os
-import re
 import shutil
 import datetime
-import subprocess
 import html
 from pathlib import Path
 
@@ -37,59 +35,14 @@ from PySide6.QtWidgets import (
     QDialog, QDialogButtonBox, QMainWindow, QFormLayout, QMessageBox,
     QComboBox, QSpinBox, QCheckBox, QDoubleSpinBox, QGroupBox, QColorDialog
 )
-from PySide6.QtGui import QColor
 
-# Import the dark theme library
-# Requires: pip install pyqtdarktheme
-import qdarktheme
-
-# ---------- Constants ----------
-WIDTH, HEIGHT, FPS, CRF = 1920, 1080, 30, 20
-AUDIO_BITRATE = "192k"
-
-# ---------- Core Utilities ----------
-
-def have(cmd: str) -> bool:
-    """Check if a command-line utility is available in the system's PATH."""
-    return shutil.which(cmd) is not None
-
-def ensure_ffmpeg():
-    """Raise a RuntimeError if ffmpeg or ffprobe are not found."""
-    if not have("ffmpeg") or not have("ffprobe"):
-        raise RuntimeError("ffmpeg and/or ffprobe not found in your system's PATH.")
-
-def sanitize_filename(name: str) -> str:
-    """Clean a string to be a valid, safe filename."""
-    name = name.strip()
-    name = re.sub(r"[^\w\-. ]+", "_", name)
-    name = re.sub(r"\s+", " ", name).strip()
-    return name or "output"
-
-def ffprobe_duration_seconds(path: str) -> float:
-    """
-    Get the duration of a media file in seconds using ffprobe.
-    This is a synchronous (blocking) call, but ffprobe is fast.
-    """
-    # Add CREATE_NO_WINDOW flag for Windows to suppress console popup
-    creation_flags = 0
-    if sys.platform == 'win32':
-        creation_flags = subprocess.CREATE_NO_WINDOW
-
-    proc = subprocess.run(
-        ["ffprobe", "-v", "error", "-show_entries", "format=duration",
-         "-of", "default=noprint_wrappers=1:nokey=1", path],
-        stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
-        creationflags=creation_flags
-    )
-    try:
-        return float(proc.stdout.strip())
-    except Exception:
-        return 0.0
-
-def is_video_file(path: str) -> bool:
-    """Check if a file is a video file based on extension."""
-    video_extensions = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.flv', '.wmv', '.m4v', '.mpg', '.mpeg'}
-    return Path(path).suffix.lower() in video_extensions
+# Constants, utilities and the command builder live in the Qt-free core module
+from panek_video_core import (
+    CONTACT_SHEET_COLS, CONTACT_SHEET_ROWS, ENCODING_PROFILES, DEFAULT_PROFILE, load_profile_calibration,
+    ensure_ffmpeg, sanitize_filename, ffprobe_duration_seconds, has_encoder, has_filter,
+    render_duration_seconds, parse_progress_seconds, sidecar_outputs, build_ffmpeg_cmd,
+    plan_resumable_render, record_segment_run, build_join_cmd
+)
 
 # ---------- UI: Complete Dialog ----------
 
@@ -97,7 +50,7 @@ class CompleteDialog(QDialog):
     """
     A dialog shown on successful render.
     """
-    def __init__(self, out_path: str, parent=None):
+    def __init__(self, out_path: str, artifacts: dict = None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Render Complete")
         self.setModal(True)
@@ -113,6 +66,7 @@ class CompleteDialog(QDialog):
         self.msg.setTextInteractionFlags(Qt.TextInteractionFlag.TextBrowserInteraction)
         self.msg.setOpenExternalLinks(True)
         self.out_path = out_path
+        self.artifacts = artifacts or {}
         lay.addWidget(self.msg)
 
         btns = QDialogButtonBox(self)
@@ -129,8 +83,11 @@ class CompleteDialog(QDialog):
         """Update the label text."""
         # Escape the output path to prevent HTML injection
         safe_path = html.escape(self.out_path)
+        extras = "".join(f"<br><code>{html.escape(p)}</code>" for p in self.artifacts.values())
+        if extras:
+            extras = f"<br><br>Extra outputs:{extras}"
         self.msg.setText(
-            f"Video created successfully:<br><code>{safe_path}</code><br><br>"
+            f"Video created successfully:<br><code>{safe_path}</code>{extras}<br><br>"
             f"<small>Powered by <a href='https://ffmpeg.org'>FFmpeg</a> (LGPL/GPL)</small>"
         )
         self.close_btn.setText(f"Close (in {self.seconds})")
@@ -152,7 +109,7 @@ class FFmpegRunner(QObject):
     """
     # Signals to communicate with the main UI thread
     process_started = Signal()
-    process_finished = Signal(int, str)  # Emits exit_code, output_path
+    process_finished = Signal(int, str, dict)  # Emits exit_code, output_path, artifacts
     log_message = Signal(str)            # Emits log lines
     progress_updated = Signal(int)       # Emits progress percentage (0-100)
 
@@ -164,25 +121,48 @@ class FFmpegRunner(QObject):
         self.process.readyReadStandardOutput.connect(self._read_progress)
         self.process.readyReadStandardError.connect(self._read_logs)
         self.process.finished.connect(self._on_finished)
-        self.process.started.connect(self.process_started.emit)
+        self.process.started.connect(self._on_started)
         self.process.errorOccurred.connect(self._on_error)
 
         self.audio_duration = 0.0
         self.output_path = ""
+        self.sidecars = {}  # Requested sidecar artifacts (kind -> path)
+
+        # A render runs as one or more ffmpeg steps; resumable renders encode
+        # the missing segments and then join them
+        self.steps = []           # (command list, seconds done before the step)
+        self.step_index = 0
+        self.parts_dir = ""       # Segment folder of a resumable render
+        self.segment_runs = []    # (first, end) segments encoded by each step of a resumable render
+        self.title = ""
+        self.stop_mode = ""       # "cancel" or "pause" once the user stops the render
+        self.paused = False
+
+    def _on_started(self):
+        """Forward QProcess.started for the first step only, so the UI sees one render."""
+        if self.step_index == 0:
+            self.process_started.emit()
+
+    def _start_step(self):
+        """Launch the current step's ffmpeg command."""
+        cmd_list = self.steps[self.step_index][0]
+        self.log_message.emit(f"Executing command: {' '.join(cmd_list)}")
+
+        # Use start() which is non-blocking
+        self.process.start("ffmpeg", cmd_list[1:])
 
     def _read_progress(self):
         """Read and parse progress data from ffmpeg's stdout."""
         if not self.process:
             return
         output = self.process.readAllStandardOutput().data().decode(errors='ignore').strip()
-        
-        for line in output.splitlines():
-            # Parse progress lines like 'out_time_ms=12345000'
-            m = re.search(r"out_time_ms=(\d+)", line)
-            if m and self.audio_duration > 0:
-                current_ms = int(m.group(1)) / 1_000_000.0
-                pct = int(min(100, (current_ms / self.audio_duration) * 100))
-                self.progress_updated.emit(pct)
+
+        # Parse progress lines like 'out_time_ms=12345000'
+        current = parse_progress_seconds(output)
+        if current is not None and self.audio_duration > 0:
+            done_before = self.steps[self.step_index][1] if self.steps else 0.0
+            pct = int(min(100, ((done_before + current) / self.audio_duration) * 100))
+            self.progress_updated.emit(pct)
 
     def _read_logs(self):
         """Read log data from ffmpeg's stderr."""
@@ -207,116 +187,85 @@ class FFmpegRunner(QObject):
         error_msg = error_messages.get(error, "Unknown error occurred.")
         self.log_message.emit(f"--- PROCESS ERROR: {error_msg} ---")
         # Emit finished signal with error code -1
-        self.process_finished.emit(-1, "")
+        self.process_finished.emit(-1, "", {})
 
     def _on_finished(self, exit_code, exit_status):
         """
         Handle the QProcess.finished signal.
         Emits the custom process_finished signal for the UI.
         """
+        # Record a finished segment step; the join follows the last one
+        if exit_code == 0 and not self.stop_mode and self.step_index < len(self.segment_runs):
+            exit_code = self._finish_segment_step()
+
+        # Move on to the next step of a multi-step render
+        if exit_code == 0 and not self.stop_mode and self.step_index + 1 < len(self.steps):
+            self.step_index += 1
+            self._start_step()
+            return
+
+        if self.parts_dir:
+            if self.stop_mode == "pause":
+                self.paused = True
+                self.log_message.emit("--- RENDER PAUSED ---")
+                self.log_message.emit(f"Finished segments are kept in: {self.parts_dir}")
+                self.log_message.emit("Start the same render again to resume.")
+            elif exit_code == 0 or self.stop_mode == "cancel":
+                # Joined or abandoned; the segments are no longer needed
+                shutil.rmtree(self.parts_dir, ignore_errors=True)
+
+        artifacts = {}
         if exit_code == 0:
             self.log_message.emit(f"--- PROCESS COMPLETE ---")
             self.log_message.emit(f"Output file: {self.output_path}")
+            for kind, path in self.sidecars.items():
+                if os.path.exists(path):
+                    artifacts[kind] = path
+                    self.log_message.emit(f"Artifact ({kind}): {path}")
+                else:
+                    self.log_message.emit(f"Warning: {kind} artifact was not written: {path}")
             self.progress_updated.emit(100)
-        else:
+        elif not self.paused:
             self.log_message.emit(f"--- PROCESS FAILED (Code: {exit_code}) ---")
 
-        self.process_finished.emit(exit_code, self.output_path)
-
-    def _build_ffmpeg_cmd(self, media_path: str, audio_path: str, out_path: str, title: str,
-                          text_overlay: str = "", text_position: str = "center", text_size: int = 48,
-                          text_color: str = "white", fade_in: float = 0.0, fade_out: float = 0.0,
-                          media_duration: float = 0.0) -> list:
-        """Build the ffmpeg command list with support for video input, text overlays, and fades."""
-
-        # Build video filter chain
-        vf_filters = []
-
-        # Scaling and padding filter (works for both image and video)
-        vf_filters.append(f"scale={WIDTH}:{HEIGHT}:force_original_aspect_ratio=decrease,pad={WIDTH}:{HEIGHT}:(ow-iw)/2:(oh-ih)/2")
-
-        # Add fade filters if requested
-        if fade_in > 0:
-            vf_filters.append(f"fade=t=in:st=0:d={fade_in}")
-        if fade_out > 0:
-            fade_start = max(0, media_duration - fade_out)
-            vf_filters.append(f"fade=t=out:st={fade_start}:d={fade_out}")
-
-        # Add text overlay if provided
-        if text_overlay:
-            # Escape text for FFmpeg drawtext filter
-            # Must escape backslash first to avoid double-escaping
-            safe_text = text_overlay.replace("\\", "\\\\").replace(":", "\\:").replace("'", "\\'")
-
-            # Calculate position
-            if text_position == "top":
-                x_pos, y_pos = "(w-text_w)/2", "50"
-            elif text_position == "bottom":
-                x_pos, y_pos = "(w-text_w)/2", "h-th-50"
-            else:  # center
-                x_pos, y_pos = "(w-text_w)/2", "(h-text_h)/2"
-
-            vf_filters.append(f"drawtext=text='{safe_text}':fontsize={text_size}:fontcolor={text_color}:x={x_pos}:y={y_pos}")
-
-        # Combine all video filters
-        vf = ",".join(vf_filters)
-
-        # Build audio filter chain
-        af_filters = []
-        if fade_in > 0:
-            af_filters.append(f"afade=t=in:st=0:d={fade_in}")
-        if fade_out > 0:
-            fade_start = max(0, media_duration - fade_out)
-            af_filters.append(f"afade=t=out:st={fade_start}:d={fade_out}")
-
-        # Check if input is video or image
-        is_video = is_video_file(media_path)
-
-        # Build command
-        cmd = ["ffmpeg", "-y"]
-
-        # Input handling: video vs image
-        if is_video:
-            cmd.extend(["-i", media_path])
-        else:
-            cmd.extend(["-loop", "1", "-i", media_path])
-
-        # Audio input
-        cmd.extend(["-i", audio_path])
+        self.process_finished.emit(exit_code, self.output_path, artifacts)
 
-        # Video encoding settings
-        if is_video:
-            cmd.extend(["-c:v", "libx264", "-preset", "medium", "-crf", str(CRF)])
-        else:
-            cmd.extend(["-c:v", "libx264", "-preset", "medium", "-crf", str(CRF), "-tune", "stillimage"])
-
-        # Video filters
-        cmd.extend(["-vf", vf, "-r", str(FPS), "-pix_fmt", "yuv420p"])
-
-        # Audio encoding and filters
-        cmd.extend(["-c:a", "aac", "-b:a", AUDIO_BITRATE])
-        if af_filters:
-            cmd.extend(["-af", ",".join(af_filters)])
-
-        cmd.extend(["-shortest"])
-
-        # Optimization and metadata
-        cmd.extend([
-            "-movflags", "+faststart",
-            "-color_primaries", "bt709", "-color_trc", "bt709", "-colorspace", "bt709",
-            "-metadata", f"title={title}",
-            "-progress", "pipe:1",
-            out_path
-        ])
-
-        return cmd
+    def _finish_segment_step(self) -> int:
+        """Record the segments the current step wrote and queue the join after the last step."""
+        try:
+            record_segment_run(self.parts_dir, *self.segment_runs[self.step_index])
+            if self.step_index + 1 == len(self.segment_runs):
+                self._queue_join()
+        except (OSError, RuntimeError) as e:
+            self.log_message.emit(f"Error: {e}")
+            return -1
+        return 0
+
+    def _queue_join(self):
+        """Append the join step, built from the journal so it only runs when every segment is present."""
+        cmd_list = build_join_cmd(self.parts_dir, self.output_path, self.title)
+        self.steps.append((cmd_list, self.audio_duration))
+
+    def _sidecar_outputs(self, out_path: str, thumbnail_at, contact_sheet: bool, waveform: bool) -> dict:
+        """Return the enabled sidecar artifacts for a render (see panek_video_core.sidecar_outputs)."""
+        return sidecar_outputs(out_path, thumbnail_at, contact_sheet, waveform)
+
+    def _build_ffmpeg_cmd(self, *args, **kwargs) -> list:
+        """Build the ffmpeg command list (see panek_video_core.build_ffmpeg_cmd)."""
+        return build_ffmpeg_cmd(*args, **kwargs)
 
     def start_processing(self, media_path: str, audio_path: str, output_path: str, title: str,
                         text_overlay: str = "", text_position: str = "center", text_size: int = 48,
-                        text_color: str = "white", fade_in: float = 0.0, fade_out: float = 0.0):
+                        text_color: str = "white", fade_in: float = 0.0, fade_out: float = 0.0,
+                        thumbnail_at: float = None, contact_sheet: bool = False, waveform: bool = False,
+                        resumable: bool = False, profile: str = DEFAULT_PROFILE):
         """
         Start the ffmpeg process. This is the main entry point.
         Path and title are now calculated and validated by the UI.
+
+        With `resumable`, the video is encoded as segments next to the output
+        (see panek_video_core.plan_resumable_render); starting the same render
+        again after a crash, cancel or pause only encodes what is missing.
         """
         if self.process.state() == QProcess.ProcessState.Running:
             self.log_message.emit("Error: A process is already running.")
@@ -327,34 +276,91 @@ class FFmpegRunner(QObject):
             self.audio_duration = ffprobe_duration_seconds(audio_path)
             if self.audio_duration == 0.0:
                 self.log_message.emit("Error: Could not determine audio duration or audio is 0s long.")
-                self.process_finished.emit(-1, "") # Emit failure
+                self.process_finished.emit(-1, "", {}) # Emit failure
                 return
         except Exception as e:
             self.log_message.emit(f"Error running ffprobe: {e}")
-            self.process_finished.emit(-1, "") # Emit failure
+            self.process_finished.emit(-1, "", {}) # Emit failure
             return
 
-        # 2. Store the output path for later reference
-        self.output_path = output_path
-
-        # 3. Build and run command
-        cmd_list = self._build_ffmpeg_cmd(
-            media_path, audio_path, self.output_path, title,
-            text_overlay, text_position, text_size, text_color,
-            fade_in, fade_out, self.audio_duration
-        )
-
-        self.log_message.emit(f"Executing command: {' '.join(cmd_list)}")
+        # 2. Fail fast if the local ffmpeg lacks the encoder or filters this render needs
+        # (probe is cached per binary). If the probe itself failed (None), let ffmpeg
+        # report any problem when it runs.
+        if has_encoder("libx264") is False:
+            self.log_message.emit("Error: This ffmpeg build has no libx264 encoder, which every encoding profile uses.")
+            self.process_finished.emit(-1, "", {}) # Emit failure
+            return
+        if text_overlay and has_filter("drawtext") is False:
+            self.log_message.emit("Error: This ffmpeg build has no drawtext filter, so text overlays are unavailable.")
+            self.process_finished.emit(-1, "", {}) # Emit failure
+            return
 
-        # Use start() which is non-blocking
-        self.process.start("ffmpeg", cmd_list[1:])
+        # 3. Store the output path and requested artifacts for later reference
+        self.output_path = output_path
+        self.sidecars = self._sidecar_outputs(output_path, thumbnail_at, contact_sheet, waveform)
+        self.step_index = 0
+        self.stop_mode = ""
+        self.paused = False
+        self.parts_dir = ""
+        self.segment_runs = []
+        self.title = title
+
+        # 4. Build the command(s)
+        if resumable:
+            if self.sidecars:
+                self.log_message.emit("Warning: Extra outputs are only produced by single-pass renders; skipping them.")
+                self.sidecars = {}
+            try:
+                plan = plan_resumable_render(
+                    media_path, audio_path, self.output_path, title,
+                    text_overlay, text_position, text_size, text_color,
+                    fade_in, fade_out, self.audio_duration, profile
+                )
+                self.parts_dir = plan["parts_dir"]
+                self.steps = plan["steps"]
+                self.segment_runs = plan["runs"]
+                if not self.steps:  # Every segment is done; only the join is left
+                    self._queue_join()
+            except (OSError, RuntimeError) as e:
+                self.log_message.emit(f"Error preparing resumable render: {e}")
+                self.process_finished.emit(-1, "", {}) # Emit failure
+                return
+            if plan["done"]:
+                self.log_message.emit(
+                    f"Resuming: {len(plan['done'])} of {plan['count']} segments already complete."
+                )
+        else:
+            cmd_list = self._build_ffmpeg_cmd(
+                media_path, audio_path, self.output_path, title,
+                text_overlay, text_position, text_size, text_color,
+                fade_in, fade_out, self.audio_duration,
+                thumbnail_at, contact_sheet, waveform, profile,
+                render_duration_seconds(media_path, self.audio_duration)
+            )
+            self.steps = [(cmd_list, 0.0)]
+
+        # 5. Run the first step
+        self._start_step()
+
+    def cancel_process(self, pause: bool = False):
+        """
+        Public method to cancel the running process.
 
-    def cancel_process(self):
-        """Public method to cancel the running process."""
+        With `pause`, the finished segments of a resumable render are kept so
+        the render can be resumed later; otherwise they are discarded.
+        """
         if self.process.state() == QProcess.ProcessState.Running:
-            self.log_message.emit("--- CANCELLING PROCESS ---")
+            self.stop_mode = "pause" if pause and self.parts_dir else "cancel"
+            if self.stop_mode == "pause":
+                self.log_message.emit("--- PAUSING PROCESS ---")
+            else:
+                self.log_message.emit("--- CANCELLING PROCESS ---")
             self.process.terminate()
 
+    def pause_process(self):
+        """Stop a resumable render, keeping the work done so far."""
+        self.cancel_process(pause=True)
+
 # ---------- UI: Main Window ----------
 
 class MainWindow(QMainWindow):
@@ -375,6 +381,7 @@ class MainWindow(QMainWindow):
         self._create_io_widgets()
         self._create_text_overlay_widgets()
         self._create_fade_widgets()
+        self._create_sidecar_widgets()
         self._create_action_widgets()
         self._create_status_widgets()
         self._create_footer()
@@ -414,14 +421,43 @@ class MainWindow(QMainWindow):
         self.title_edit = QLineEdit()
         self.title_edit.setPlaceholderText("Optional (defaults to timestamp)")
 
+        # --- Encoding Profile ---
+        self.profile_combo = QComboBox()
+        calibration = load_profile_calibration()
+        for name, settings in ENCODING_PROFILES.items():
+            self.profile_combo.addItem(settings["label"], name)
+            index = self.profile_combo.count() - 1
+            self.profile_combo.setItemData(index, self._profile_tooltip(settings, calibration.get(name)),
+                                           Qt.ItemDataRole.ToolTipRole)
+        self.profile_combo.setCurrentIndex(self.profile_combo.findData(DEFAULT_PROFILE))
+
         # Use helper to create the [LineEdit] [Button] widgets
         io_layout.addRow("Media File:", self._create_browse_widget(self.media_path_edit, self.media_browse_btn))
         io_layout.addRow("Audio File:", self._create_browse_widget(self.audio_path_edit, self.audio_browse_btn))
         io_layout.addRow("Output Folder:", self._create_browse_widget(self.output_dir_edit, self.output_dir_browse_btn))
         io_layout.addRow("Video Title:", self.title_edit)
+        io_layout.addRow("Encoding Profile:", self.profile_combo)
 
         self.main_layout.addLayout(io_layout)
 
+    def _profile_tooltip(self, settings, measured):
+        """Describe a profile's settings and, once calibrated, its measured trade-offs."""
+        tip = (f"{settings['width']}x{settings['height']} @ {settings['fps']} fps, "
+               f"x264 {settings['preset']} crf {settings['crf']}, audio {settings['audio_bitrate']}")
+        # Show whatever was measured; the file may be partial or edited by hand
+        parts = []
+        if isinstance(measured, dict):
+            for key, fmt in (("encode_fps", "{:.0f} fps encode"), ("bitrate_kbps", "{:.0f} kb/s"),
+                             ("ssim", "SSIM {:.4f}"), ("psnr", "PSNR {:.1f} dB")):
+                value = measured.get(key)
+                if isinstance(value, (int, float)):
+                    parts.append(fmt.format(value))
+        if parts:
+            tip += "\nMeasured: " + ", ".join(parts)
+        else:
+            tip += "\nNot calibrated yet (run panek_video_calibrate.py)"
+        return tip
+
     def _create_browse_widget(self, line_edit, button):
         """Helper to create the LineEdit + Button combo."""
         widget = QWidget()
@@ -494,6 +530,35 @@ class MainWindow(QMainWindow):
         group_box.setLayout(layout)
         self.main_layout.addWidget(group_box)
 
+    def _create_sidecar_widgets(self):
+        """Create controls for the extra artifacts rendered in the same pass."""
+        group_box = QGroupBox("Extra Outputs (Optional)")
+        layout = QFormLayout()
+
+        # Thumbnail still at a chosen timestamp
+        self.thumbnail_check = QCheckBox("Save still at")
+        self.thumbnail_at_spin = QDoubleSpinBox()
+        self.thumbnail_at_spin.setRange(0, 36000)
+        self.thumbnail_at_spin.setValue(5)
+        self.thumbnail_at_spin.setSingleStep(1)
+        self.thumbnail_at_spin.setSuffix(" sec")
+        thumb_widget = QWidget()
+        thumb_layout = QHBoxLayout(thumb_widget)
+        thumb_layout.setContentsMargins(0, 0, 0, 0)
+        thumb_layout.addWidget(self.thumbnail_check)
+        thumb_layout.addWidget(self.thumbnail_at_spin)
+        thumb_layout.addStretch()
+        layout.addRow("Thumbnail:", thumb_widget)
+
+        # Contact sheet and audio waveform
+        self.contact_sheet_check = QCheckBox(f"{CONTACT_SHEET_COLS}x{CONTACT_SHEET_ROWS} grid of frames")
+        layout.addRow("Contact Sheet:", self.contact_sheet_check)
+        self.waveform_check = QCheckBox("Audio waveform image")
+        layout.addRow("Waveform:", self.waveform_check)
+
+        group_box.setLayout(layout)
+        self.main_layout.addWidget(group_box)
+
     def _choose_text_color(self):
         """Open color picker dialog for text color."""
         color = QColorDialog.getColor()
@@ -502,14 +567,23 @@ class MainWindow(QMainWindow):
             self.text_color_preview.setStyleSheet(f"background-color: {color.name()}; border: 1px solid gray;")
 
     def _create_action_widgets(self):
-        """Create the Start and Cancel buttons."""
+        """Create the Start, Pause and Cancel buttons."""
         action_layout = QHBoxLayout()
+        self.resumable_check = QCheckBox("Resumable (render in segments)")
+        self.resumable_check.setToolTip(
+            "Encode in segments next to the output file. A crashed, cancelled or paused\n"
+            "render picks up where it stopped when started again. Extra outputs are skipped."
+        )
         self.start_btn = QPushButton("Start Processing")
+        self.pause_btn = QPushButton("Pause")
+        self.pause_btn.setEnabled(False)
         self.cancel_btn = QPushButton("Cancel")
         self.cancel_btn.setEnabled(False)
         
+        action_layout.addWidget(self.resumable_check)
         action_layout.addStretch()
         action_layout.addWidget(self.start_btn)
+        action_layout.addWidget(self.pause_btn)
         action_layout.addWidget(self.cancel_btn)
         self.main_layout.addLayout(action_layout)
 
@@ -552,7 +626,8 @@ class MainWindow(QMainWindow):
         self.output_dir_browse_btn.clicked.connect(self._on_browse_output_dir)
 
         self.start_btn.clicked.connect(self._start_processing)
-        self.cancel_btn.clicked.connect(self.ffmpeg_runner.cancel_process)
+        self.pause_btn.clicked.connect(self.ffmpeg_runner.pause_process)
+        self.cancel_btn.clicked.connect(lambda: self.ffmpeg_runner.cancel_process())
 
         # FFmpegRunner signals
         self.ffmpeg_runner.process_started.connect(self._on_process_started)
@@ -619,10 +694,21 @@ class MainWindow(QMainWindow):
         title = sanitize_filename(title)
         output_path = os.path.abspath(os.path.join(self.output_dir, f"{title}.mp4"))
 
-        # --- 3. Implement overwrite check ---
-        if os.path.exists(output_path):
+        # --- 3. Collect sidecar artifact options ---
+        thumbnail_at = self.thumbnail_at_spin.value() if self.thumbnail_check.isChecked() else None
+        contact_sheet = self.contact_sheet_check.isChecked()
+        waveform = self.waveform_check.isChecked()
+        resumable = self.resumable_check.isChecked()
+
+        # --- 4. Implement overwrite check (video and any sidecar artifacts) ---
+        targets = [output_path]
+        if not resumable:  # Resumable renders skip the extra outputs
+            targets += list(sidecar_outputs(output_path, thumbnail_at, contact_sheet, waveform).values())
+        existing = [path for path in targets if os.path.exists(path)]
+        if existing:
+            listing = "\n".join(existing)
             reply = QMessageBox.question(self, "Overwrite Confirmation",
-                f"The file already exists:\n{output_path}\n\nDo you want to overwrite it?",
+                f"The following file(s) already exist:\n{listing}\n\nDo you want to overwrite them?",
                 QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                 QMessageBox.StandardButton.No) # Default to No
 
@@ -630,7 +716,7 @@ class MainWindow(QMainWindow):
                 self.status_label.setText("Idle. Overwrite cancelled by user.")
                 return
 
-        # --- 4. Collect text overlay and fade parameters ---
+        # --- 5. Collect text overlay and fade parameters ---
         text_overlay = self.text_overlay_edit.text().strip()
         text_position = self.text_position_combo.currentText().lower()
         text_size = self.text_size_spin.value()
@@ -638,7 +724,7 @@ class MainWindow(QMainWindow):
         fade_in = self.fade_in_spin.value()
         fade_out = self.fade_out_spin.value()
 
-        # --- 5. Start the runner with all parameters ---
+        # --- 6. Start the runner with all parameters ---
         self.ffmpeg_runner.start_processing(
             self.media_path,
             self.audio_path,
@@ -649,7 +735,12 @@ class MainWindow(QMainWindow):
             text_size,
             text_color,
             fade_in,
-            fade_out
+            fade_out,
+            thumbnail_at,
+            contact_sheet,
+            waveform,
+            resumable,
+            self.profile_combo.currentData()
         )
 
     def _on_process_started(self):
@@ -659,20 +750,25 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(True)
         self.start_btn.setEnabled(False)
+        self.pause_btn.setEnabled(self.resumable_check.isChecked())
         self.cancel_btn.setEnabled(True)
         self._set_inputs_enabled(False)
 
-    def _on_process_finished(self, exit_code, output_path):
+    def _on_process_finished(self, exit_code, output_path, artifacts):
         """Update UI to reflect the "finished" state."""
         self.start_btn.setEnabled(True)
+        self.pause_btn.setEnabled(False)
         self.cancel_btn.setEnabled(False)
         self._set_inputs_enabled(True)
         self.progress_bar.setVisible(False)
 
-        if exit_code == 0:
+        if self.ffmpeg_runner.paused:
+            self.status_label.setText("Paused. Start again with the same settings to resume.")
+            self.progress_bar.setValue(0)
+        elif exit_code == 0:
             self.status_label.setText("Process complete.")
             self.progress_bar.setValue(100)
-            self._show_complete_dialog(output_path)
+            self._show_complete_dialog(output_path, artifacts)
         else:
             self.status_label.setText(f"Process failed (Code: {exit_code})")
             self.progress_bar.setValue(0)
@@ -688,16 +784,22 @@ class MainWindow(QMainWindow):
         self.audio_browse_btn.setEnabled(enabled)
         self.output_dir_browse_btn.setEnabled(enabled)
         self.title_edit.setEnabled(enabled)
+        self.profile_combo.setEnabled(enabled)
         self.text_overlay_edit.setEnabled(enabled)
         self.text_position_combo.setEnabled(enabled)
         self.text_size_spin.setEnabled(enabled)
         self.text_color_btn.setEnabled(enabled)
         self.fade_in_spin.setEnabled(enabled)
         self.fade_out_spin.setEnabled(enabled)
+        self.thumbnail_check.setEnabled(enabled)
+        self.thumbnail_at_spin.setEnabled(enabled)
+        self.contact_sheet_check.setEnabled(enabled)
+        self.waveform_check.setEnabled(enabled)
+        self.resumable_check.setEnabled(enabled)
     
-    def _show_complete_dialog(self, output_path):
+    def _show_complete_dialog(self, output_path, artifacts=None):
         """Show the custom "Complete" dialog."""
-        dlg = CompleteDialog(output_path, self)
+        dlg = CompleteDialog(output_path, artifacts, self)
         result = dlg.exec()
         
         # Use QDialog.Accepted enum
@@ -720,6 +822,10 @@ class MainWindow(QMainWindow):
         self.text_color_preview.setStyleSheet("background-color: white; border: 1px solid gray;")
         self.fade_in_spin.setValue(0)
         self.fade_out_spin.setValue(0)
+        self.thumbnail_check.setChecked(False)
+        self.thumbnail_at_spin.setValue(5)
+        self.contact_sheet_check.setChecked(False)
+        self.waveform_check.setChecked(False)
         self.status_log.clear()
         self.status_label.setText("Idle")
         self.progress_bar.setValue(0)
@@ -728,7 +834,7 @@ class MainWindow(QMainWindow):
 
 # ---------- Application Entry Point ----------
 
-if __name__ == "__main__":
+def main():
     # Ensure ffmpeg/ffprobe exist before launching the app
     try:
         ensure_ffmpeg()
@@ -741,8 +847,11 @@ if __name__ == "__main__":
     # Initialize the Qt Application
     app = QApplication(sys.argv)
 
-    # Apply the dark theme globally
-    qdarktheme.setup_theme("dark") 
+    # Apply the dark theme globally. Imported here so that importing this
+    # module (e.g. for FFmpegRunner) does not pay for the theme library.
+    # Requires: pip install pyqtdarktheme
+    import qdarktheme
+    qdarktheme.setup_theme("dark")
 
     # Create and show the main window
     window = MainWindow()
@@ -750,3 +859,6 @@ if __name__ == "__main__":
 
     # Start the Qt event loop
     sys.exit(app.exec())
+
+if __name__ == "__main__":
+    main()
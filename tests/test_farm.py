@@ -0,0 +1,128 @@
+"""
+Checks for the render farm's job queue, manifest validation and result upload.
+Run with: python -m unittest discover -s tests
+"""
+
+import os
+import time
+import tempfile
+import unittest
+
+from panek_video_farm import JobQueue, normalize_job, upload
+
+def expire(queue: JobQueue, job_id: str):
+    """Make a job's lease look as if its worker went silent."""
+    queue.jobs[job_id]["expires"] = time.time() - 1
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        self.queue = JobQueue(tempfile.gettempdir(), lease_seconds=30, max_attempts=3)
+        self.job_id = self.queue.submit({"title": "job"})
+
+    def status(self) -> str:
+        return self.queue.jobs[self.job_id]["status"]
+
+    def test_heartbeat_renews_lease(self):
+        lease = self.queue.lease("w1")["lease"]
+        self.queue.jobs[self.job_id]["expires"] = time.time() + 1
+        self.assertTrue(self.queue.heartbeat(self.job_id, lease, 40))
+        self.assertGreater(self.queue.jobs[self.job_id]["expires"], time.time() + 20)
+        self.assertEqual(self.queue.jobs[self.job_id]["progress"], 40)
+
+    def test_expired_lease_is_requeued_for_another_worker(self):
+        first = self.queue.lease("w1")
+        expire(self.queue, self.job_id)
+        second = self.queue.lease("w2")
+        self.assertEqual(second["id"], self.job_id)
+        self.assertNotEqual(second["lease"], first["lease"])
+        self.assertEqual(self.queue.jobs[self.job_id]["attempts"], 2)
+        self.assertIn("w1", self.queue.jobs[self.job_id]["error"])
+
+    def test_expired_lease_is_void_before_reaping(self):
+        lease = self.queue.lease("w1")["lease"]
+        expire(self.queue, self.job_id)
+        self.assertFalse(self.queue.heartbeat(self.job_id, lease, 50))
+        self.assertFalse(self.queue.complete(self.job_id, lease, 0, {"output": "late.mp4"}))
+        self.assertEqual(self.status(), "running")
+        self.queue.requeue_expired()
+        self.assertEqual(self.status(), "queued")
+
+    def test_stale_lease_cannot_complete_a_retry(self):
+        stale = self.queue.lease("w1")["lease"]
+        expire(self.queue, self.job_id)
+        current = self.queue.lease("w2")["lease"]
+        self.assertFalse(self.queue.complete(self.job_id, stale, 0, {}))
+        self.assertTrue(self.queue.complete(self.job_id, current, 0, {"output": "ok.mp4"}))
+        self.assertEqual(self.status(), "done")
+
+    def test_fails_after_max_attempts(self):
+        for _ in range(2):
+            lease = self.queue.lease("w")["lease"]
+            self.assertTrue(self.queue.complete(self.job_id, lease, 1, {}, "boom"))
+            self.assertEqual(self.status(), "queued")
+        self.queue.lease("w")
+        expire(self.queue, self.job_id)
+        self.queue.requeue_expired()
+        self.assertEqual(self.status(), "failed")
+        self.assertIsNone(self.queue.lease("w"))
+
+class NormalizeJobTest(unittest.TestCase):
+    base = {"media": "cover.png", "audio": "song.mp3"}
+
+    def test_defaults_and_absolute_paths(self):
+        job = normalize_job(dict(self.base), "/renders")
+        self.assertEqual(job["media"], os.path.abspath("/renders/cover.png"))
+        self.assertEqual(job["text_size"], 48)
+        self.assertEqual(job["profile"], "standard")
+
+    def test_accepts_gui_values(self):
+        normalize_job(dict(self.base, text_color="#ff8800", text_size=200, fade_in=2.5,
+                           thumbnail_at=0, waveform=True, text_position="bottom"))
+
+    def test_rejects_bad_values(self):
+        bad = [
+            {"fade_in": "x"}, {"fade_out": -1}, {"thumbnail_at": float("nan")},
+            {"text_size": 11}, {"text_size": 201}, {"text_size": 48.5}, {"text_size": True},
+            {"text_color": "white:textfile=/etc/passwd"}, {"text_color": "white\n"},
+            {"text_position": "left"}, {"waveform": 1}, {"contact_sheet": "yes"},
+            {"title": 5}, {"output_dir": ["x"]}, {"profile": "ultra"}, {"unknown": 1},
+        ]
+        for extra in bad:
+            with self.subTest(extra=extra), self.assertRaises(ValueError):
+                normalize_job(dict(self.base, **extra))
+
+class UploadTest(unittest.TestCase):
+    def test_never_replaces_an_existing_result(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "render.mp4")
+            dest = os.path.join(tmp, "results.mp4")
+            with open(src, "wb") as f:
+                f.write(b"new")
+            with open(dest, "wb") as f:
+                f.write(b"old")
+            with self.assertRaises(FileExistsError):
+                upload(src, dest, "job1")
+            with open(dest, "rb") as f:
+                self.assertEqual(f.read(), b"old")
+            self.assertEqual(sorted(os.listdir(tmp)), ["render.mp4", "results.mp4"])
+
+            other = os.path.join(tmp, "other.mp4")
+            self.assertEqual(upload(src, other, "job2"), other)
+            with open(other, "rb") as f:
+                self.assertEqual(f.read(), b"new")
+
+    def test_retry_replaces_its_own_earlier_output(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "render.mp4")
+            dest = os.path.join(tmp, "song-job1.mp4")
+            with open(src, "wb") as f:
+                f.write(b"retry")
+            with open(dest, "wb") as f:
+                f.write(b"first attempt")
+            self.assertEqual(upload(src, dest, "job1-lease2", replace=True), dest)
+            with open(dest, "rb") as f:
+                self.assertEqual(f.read(), b"retry")
+            self.assertEqual(sorted(os.listdir(tmp)), ["render.mp4", "song-job1.mp4"])
+
+if __name__ == "__main__":
+    unittest.main()
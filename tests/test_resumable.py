@@ -0,0 +1,134 @@
+"""
+Checks for resumable-render bookkeeping: segment verification, recording and
+the join. Segments are stand-in files, so neither ffmpeg nor Qt is needed.
+Run with: python -m unittest discover -s tests
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from panek_video_core import (
+    _missing_runs, load_journal, save_journal, verify_segments, record_segment_run, build_join_cmd
+)
+
+SEGMENT = 60.0
+
+class MissingRunsTest(unittest.TestCase):
+    def test_groups_missing_segments(self):
+        self.assertEqual(_missing_runs(set(), 3), [(0, 3)])
+        self.assertEqual(_missing_runs({0, 1, 2}, 3), [])
+        self.assertEqual(_missing_runs({0, 3}, 6), [(1, 3), (4, 6)])
+        self.assertEqual(_missing_runs({1}, 2), [(0, 1)])
+
+class SegmentTestCase(unittest.TestCase):
+    def setUp(self):
+        self.parts_dir = tempfile.mkdtemp(prefix="panek-test-")
+        self.addCleanup(shutil.rmtree, self.parts_dir)
+        self.journal = {"params": {"encode": {"fps": 30}}, "segment_seconds": SEGMENT,
+                        "duration": 250.0, "count": 5, "segments": {}}
+        save_journal(self.parts_dir, self.journal)
+
+    def write_segment(self, index: int, size: int = 1000):
+        with open(os.path.join(self.parts_dir, f"seg_{index:05d}.mkv"), "wb") as f:
+            f.write(b"\0" * size)
+
+    def write_list(self, first: int, durations: list):
+        """Write a segment list the way ffmpeg does: name, start and end per closed segment."""
+        path = os.path.join(self.parts_dir, f"segments-{first:05d}.csv")
+        with open(path, "w") as f:
+            start = 0.0
+            for offset, duration in enumerate(durations):
+                f.write(f"seg_{first + offset:05d}.mkv,{start:.6f},{start + duration:.6f}\n")
+                start += duration
+        return path
+
+class VerifySegmentsTest(SegmentTestCase):
+    def test_listed_full_segments_are_done_and_recorded(self):
+        for index in range(3):
+            self.write_segment(index)
+        self.write_list(0, [60.067, 60.0, 60.0])
+        self.assertEqual(verify_segments(self.parts_dir, self.journal), {0, 1, 2})
+        self.assertEqual(sorted(load_journal(self.parts_dir)["segments"]), ["0", "1", "2"])
+
+    def test_truncated_segment_is_rejected(self):
+        # A pause or crash closed segment 1 at 59.6 s; accepting it would drop 0.4 s
+        for index in range(2):
+            self.write_segment(index)
+        self.write_list(0, [60.0, 59.6])
+        self.assertEqual(verify_segments(self.parts_dir, self.journal), {0})
+
+    def test_segment_within_one_frame_is_accepted(self):
+        self.write_segment(0)
+        self.write_list(0, [60.0 - 0.5 / 30])
+        self.assertEqual(verify_segments(self.parts_dir, self.journal), {0})
+
+    def test_short_final_segment_is_planned_length(self):
+        self.write_segment(4)
+        self.write_list(4, [10.0])
+        self.assertEqual(verify_segments(self.parts_dir, self.journal), {4})
+
+    def test_missing_or_empty_files_are_rejected(self):
+        self.write_segment(1, size=0)
+        self.write_list(0, [60.0, 60.0])
+        self.assertEqual(verify_segments(self.parts_dir, self.journal), set())
+
+    def test_recorded_segment_needs_matching_size(self):
+        self.write_segment(0)
+        self.write_segment(1)
+        self.journal["segments"] = {"0": {"size": 1000, "duration": 60.0},
+                                    "1": {"size": 999, "duration": 60.0}}
+        self.assertEqual(verify_segments(self.parts_dir, self.journal), {0})
+        self.assertNotIn("1", load_journal(self.parts_dir)["segments"])
+
+    def test_newer_segment_list_wins(self):
+        self.write_segment(1)
+        old = self.write_list(0, [60.0, 20.0])
+        past = time.time() - 100
+        os.utime(old, (past, past))
+        self.write_list(1, [60.0])
+        self.assertEqual(verify_segments(self.parts_dir, self.journal), {1})
+
+class RecordAndJoinTest(SegmentTestCase):
+    def test_clean_step_records_its_segments(self):
+        for index in range(5):
+            self.write_segment(index)
+        self.write_list(0, [60.0] * 4 + [10.0])
+        self.assertEqual(record_segment_run(self.parts_dir, 0, 5), {0, 1, 2, 3, 4})
+        cmd = build_join_cmd(self.parts_dir, os.path.join(self.parts_dir, "out.mp4"), "t")
+        self.assertEqual(cmd[-1], os.path.join(self.parts_dir, "out.mp4"))
+        with open(os.path.join(self.parts_dir, "concat.txt")) as f:
+            self.assertEqual(len(f.readlines()), 5)
+
+    def test_inputs_ending_early_shorten_the_render(self):
+        for index in range(3):
+            self.write_segment(index)
+        self.write_list(0, [60.0, 60.0, 12.0])
+        record_segment_run(self.parts_dir, 0, 5)
+        self.assertEqual(load_journal(self.parts_dir)["count"], 3)
+        build_join_cmd(self.parts_dir, os.path.join(self.parts_dir, "out.mp4"), "t")
+
+    def test_join_refuses_missing_segments(self):
+        for index in (0, 1, 3, 4):
+            self.write_segment(index)
+        self.write_list(0, [60.0, 60.0])
+        self.write_list(3, [60.0, 10.0])
+        record_segment_run(self.parts_dir, 0, 2)
+        record_segment_run(self.parts_dir, 3, 5)
+        with self.assertRaisesRegex(RuntimeError, "seg_00002.mkv"):
+            build_join_cmd(self.parts_dir, os.path.join(self.parts_dir, "out.mp4"), "t")
+
+    def test_join_refuses_changed_segment(self):
+        self.write_segment(0)
+        self.journal["count"] = 1
+        save_journal(self.parts_dir, self.journal)
+        self.write_list(0, [60.0])
+        record_segment_run(self.parts_dir, 0, 1)
+        self.write_segment(0, size=10)
+        with self.assertRaises(RuntimeError):
+            build_join_cmd(self.parts_dir, os.path.join(self.parts_dir, "out.mp4"), "t")
+
+if __name__ == "__main__":
+    unittest.main()